@@ -7,7 +7,7 @@ from OWNd.message import OWNCommand, OWNGatewayCommand
 
 from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.const import CONF_MAC
 
@@ -21,11 +21,35 @@ from .const import (
     CONF_WORKER_COUNT,
     CONF_FILE_PATH,
     CONF_GENERATE_EVENTS,
+    CONF_EVENT_WHO_ALLOW,
+    CONF_EVENT_WHO_DENY,
+    CONF_EVENT_TYPE_ALLOW,
+    CONF_EVENT_TYPE_DENY,
+    CONF_EVENT_RATE_LIMIT,
+    CONF_DEDUP_WINDOW,
+    CONF_DEDUP_EXCLUDED_WHO,
+    CONF_BATCH_WINDOW,
+    CONF_BATCH_SIZE,
+    CONF_STATUS_VERIFICATION_DELAY,
+    CONF_RESYNC_RATE,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_INGRESS_QUEUE_SIZE,
+    CONF_INGRESS_OVERFLOW,
+    CONF_TELEMETRY_INTERVAL,
+    CONF_REORDER_WINDOW,
+    CONF_SEND_AGING,
+    CONF_COLLAPSE_COMMANDS,
+    CONF_SEND_MAX_RATE,
+    CONF_OFFLINE_QUEUE_SIZE,
+    CONF_OFFLINE_COMMAND_TTL,
+    CONF_PIPELINE_DEPTH,
+    CONF_WORKER_MAX_COUNT,
     DOMAIN,
     LOGGER,
 )
 from .validate import config_schema, format_mac
-from .gateway import MyHOMEGatewayHandler
+from .gateway import MyHOMEGatewayHandler, OUTCOME_ACK
 
 PLATFORMS = ["light", "switch", "cover", "climate", "binary_sensor", "sensor"]
 
@@ -56,6 +80,110 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if CONF_GENERATE_EVENTS in entry.options
         else False
     )
+    _event_filters = {
+        _option: str(entry.options[_option]) if _option in entry.options else ""
+        for _option in [
+            CONF_EVENT_WHO_ALLOW,
+            CONF_EVENT_WHO_DENY,
+            CONF_EVENT_TYPE_ALLOW,
+            CONF_EVENT_TYPE_DENY,
+        ]
+    }
+    _event_rate_limit = (
+        float(entry.options[CONF_EVENT_RATE_LIMIT])
+        if CONF_EVENT_RATE_LIMIT in entry.options
+        else 0
+    )
+    _dedup_window = (
+        int(entry.options[CONF_DEDUP_WINDOW])
+        if CONF_DEDUP_WINDOW in entry.options
+        else 0
+    )
+    _dedup_excluded_who = (
+        str(entry.options[CONF_DEDUP_EXCLUDED_WHO])
+        if CONF_DEDUP_EXCLUDED_WHO in entry.options
+        else "15,25"
+    )
+    _batch_window = (
+        int(entry.options[CONF_BATCH_WINDOW])
+        if CONF_BATCH_WINDOW in entry.options
+        else 0
+    )
+    _batch_size = (
+        int(entry.options[CONF_BATCH_SIZE])
+        if CONF_BATCH_SIZE in entry.options
+        else 100
+    )
+    _status_verification_delay = (
+        int(entry.options[CONF_STATUS_VERIFICATION_DELAY])
+        if CONF_STATUS_VERIFICATION_DELAY in entry.options
+        else 5
+    )
+    _resync_rate = (
+        float(entry.options[CONF_RESYNC_RATE])
+        if CONF_RESYNC_RATE in entry.options
+        else 5
+    )
+    _keepalive_interval = (
+        int(entry.options[CONF_KEEPALIVE_INTERVAL])
+        if CONF_KEEPALIVE_INTERVAL in entry.options
+        else 0
+    )
+    _keepalive_timeout = (
+        int(entry.options[CONF_KEEPALIVE_TIMEOUT])
+        if CONF_KEEPALIVE_TIMEOUT in entry.options
+        else 10
+    )
+    _ingress_queue_size = (
+        int(entry.options[CONF_INGRESS_QUEUE_SIZE])
+        if CONF_INGRESS_QUEUE_SIZE in entry.options
+        else 1000
+    )
+    _ingress_overflow = (
+        str(entry.options[CONF_INGRESS_OVERFLOW])
+        if CONF_INGRESS_OVERFLOW in entry.options
+        else "block"
+    )
+    _telemetry_interval = (
+        float(entry.options[CONF_TELEMETRY_INTERVAL])
+        if CONF_TELEMETRY_INTERVAL in entry.options
+        else 0
+    )
+    _reorder_window = (
+        int(entry.options[CONF_REORDER_WINDOW])
+        if CONF_REORDER_WINDOW in entry.options
+        else 0
+    )
+    _send_aging = (
+        float(entry.options[CONF_SEND_AGING])
+        if CONF_SEND_AGING in entry.options
+        else 5
+    )
+    _collapse_commands = (
+        entry.options[CONF_COLLAPSE_COMMANDS]
+        if CONF_COLLAPSE_COMMANDS in entry.options
+        else False
+    )
+    _send_max_rate = (
+        float(entry.options[CONF_SEND_MAX_RATE])
+        if CONF_SEND_MAX_RATE in entry.options
+        else 0
+    )
+    _offline_queue_size = (
+        int(entry.options[CONF_OFFLINE_QUEUE_SIZE])
+        if CONF_OFFLINE_QUEUE_SIZE in entry.options
+        else 100
+    )
+    _offline_command_ttl = (
+        int(entry.options[CONF_OFFLINE_COMMAND_TTL])
+        if CONF_OFFLINE_COMMAND_TTL in entry.options
+        else 30
+    )
+    _command_pipeline_depth = (
+        int(entry.options[CONF_PIPELINE_DEPTH])
+        if CONF_PIPELINE_DEPTH in entry.options
+        else 1
+    )
 
     try:
         async with aiofiles.open(_config_file_path, mode="r") as yaml_file:
@@ -79,7 +207,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         LOGGER.warning("Migrating config entry unique_id to %s", entry.unique_id)
 
     hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY] = MyHOMEGatewayHandler(
-        hass=hass, config_entry=entry, generate_events=_generate_events
+        hass=hass,
+        config_entry=entry,
+        generate_events=_generate_events,
+        event_who_allow=_event_filters[CONF_EVENT_WHO_ALLOW],
+        event_who_deny=_event_filters[CONF_EVENT_WHO_DENY],
+        event_type_allow=_event_filters[CONF_EVENT_TYPE_ALLOW],
+        event_type_deny=_event_filters[CONF_EVENT_TYPE_DENY],
+        event_rate_limit=_event_rate_limit,
+        dedup_window=_dedup_window,
+        dedup_excluded_who=_dedup_excluded_who,
+        batch_window=_batch_window,
+        batch_size=_batch_size,
+        status_verification_delay=_status_verification_delay,
+        resync_rate=_resync_rate,
+        keepalive_interval=_keepalive_interval,
+        keepalive_timeout=_keepalive_timeout,
+        ingress_queue_size=_ingress_queue_size,
+        ingress_overflow=_ingress_overflow,
+        telemetry_interval=_telemetry_interval,
+        reorder_window=_reorder_window,
+        send_aging=_send_aging,
+        collapse_commands=_collapse_commands,
+        send_max_rate=_send_max_rate,
+        offline_queue_size=_offline_queue_size,
+        offline_command_ttl=_offline_command_ttl,
+        command_pipeline_depth=_command_pipeline_depth,
     )
 
     try:
@@ -113,6 +266,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if CONF_WORKER_COUNT in entry.options
         else 1
     )
+    _command_worker_max_count = (
+        int(entry.options[CONF_WORKER_MAX_COUNT])
+        if CONF_WORKER_MAX_COUNT in entry.options
+        else 1
+    )
 
     entity_registry = er.async_get(hass)
     device_registry = dr.async_get(hass)
@@ -138,12 +296,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].listening_loop()
         )
     )
-    for i in range(_command_worker_count):
-        hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].sending_workers.append(
-            hass.loop.create_task(
-                hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].sending_loop(i)
-            )
-        )
+    hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].set_worker_bounds(
+        _command_worker_count, _command_worker_max_count
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     # Pruning lose entities and devices from the registry
     entity_entries = er.async_entries_for_config_entry(entity_registry, entry.entry_id)
@@ -214,9 +370,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 gateway = mac
         timezone = hass.config.as_dict()["time_zone"]
         if gateway in hass.data[DOMAIN]:
-            await hass.data[DOMAIN][gateway][CONF_ENTITY].send(
-                OWNGatewayCommand.set_datetime_to_now(timezone)
+            _result = await (
+                await hass.data[DOMAIN][gateway][CONF_ENTITY].send(
+                    OWNGatewayCommand.set_datetime_to_now(timezone), track=True
+                )
             )
+            if _result.outcome != OUTCOME_ACK:
+                raise HomeAssistantError(
+                    f"Time synchronisation was not acknowledged by the gateway ({_result.outcome})."
+                )
         else:
             LOGGER.error(
                 "Gateway `%s` not found, could not send time synchronisation message.",
@@ -253,7 +415,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                             hass.data[DOMAIN][gateway][CONF_ENTITY].log_id,
                             own_message,
                         )
-                        await hass.data[DOMAIN][gateway][CONF_ENTITY].send(own_message)
+                        _result = await (
+                            await hass.data[DOMAIN][gateway][CONF_ENTITY].send(
+                                own_message, track=True
+                            )
+                        )
+                        if _result.outcome != OUTCOME_ACK:
+                            raise HomeAssistantError(
+                                f"Message `{own_message}` was not acknowledged by the gateway ({_result.outcome})."
+                            )
                 else:
                     LOGGER.error(
                         "Could not parse message `%s`, not sending it.", message
@@ -270,6 +440,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+async def async_update_options(hass, entry):
+    """Apply the options that do not need the entry to be reloaded."""
+    if CONF_ENTITY not in hass.data[DOMAIN].get(entry.data[CONF_MAC], {}):
+        return
+    hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY].set_worker_bounds(
+        int(entry.options[CONF_WORKER_COUNT])
+        if CONF_WORKER_COUNT in entry.options
+        else 1,
+        int(entry.options[CONF_WORKER_MAX_COUNT])
+        if CONF_WORKER_MAX_COUNT in entry.options
+        else 1,
+    )
+
+
 async def async_unload_entry(hass, entry):
     """Unload a config entry."""
 
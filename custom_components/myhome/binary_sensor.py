@@ -18,8 +18,6 @@ from OWNd.message import (
     OWNDryContactEvent,
     OWNDryContactCommand,
     OWNLightingCommand,
-    OWNHeatingCommand,
-    OWNEnergyCommand,
     MESSAGE_TYPE_MOTION,
     MESSAGE_TYPE_PIR_SENSITIVITY,
     MESSAGE_TYPE_MOTION_TIMEOUT,
@@ -43,6 +41,7 @@ from .const import (
     DOMAIN,
     LOGGER,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
 
@@ -216,10 +215,12 @@ class MyHOMEDryContact(MyHOMEEntity, BinarySensorEntity):
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if self._attr_device_class in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class]
 
@@ -238,7 +239,7 @@ class MyHOMEDryContact(MyHOMEEntity, BinarySensorEntity):
             message.human_readable_log,
         )
         self._attr_is_on = message.is_on != self._inverted
-        self.async_schedule_update_ha_state()
+        self.publish_state()
 
 
 class MyHOMEAuxiliary(MyHOMEEntity, BinarySensorEntity):
@@ -281,10 +282,12 @@ class MyHOMEAuxiliary(MyHOMEEntity, BinarySensorEntity):
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if self._attr_device_class in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class]
 
@@ -299,7 +302,7 @@ class MyHOMEAuxiliary(MyHOMEEntity, BinarySensorEntity):
             message.human_readable_log,
         )
         self._attr_is_on = message.is_on != self._inverted
-        self.async_schedule_update_ha_state()
+        self.publish_state()
 
 
 class MyHOMEMotionSensor(MyHOMEEntity, BinarySensorEntity, RestoreEntity):
@@ -350,6 +353,7 @@ class MyHOMEMotionSensor(MyHOMEEntity, BinarySensorEntity, RestoreEntity):
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self._gateway_handler.send_status_request(OWNLightingCommand.get_pir_sensitivity(self._where))
         await self._gateway_handler.send_status_request(OWNLightingCommand.get_motion_timeout(self._where))
         state = await self.async_get_last_state()
@@ -360,6 +364,7 @@ class MyHOMEMotionSensor(MyHOMEEntity, BinarySensorEntity, RestoreEntity):
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if self._attr_device_class in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class]
 
@@ -451,18 +456,21 @@ class MyHOMEActuator(MyHOMEEntity, BinarySensorEntity):
                 "A": where[: len(where) // 2],
                 "PL": where[len(where) // 2 :],
             }
+            self._status_frame = CommandFrame(OWNLightingCommand.status(self._full_where))
         elif self._who == "4":
             if self._interface is not None:
                 raise ValueError("Interface cannot be set with WHO=4")
             self._attr_extra_state_attributes = {
                 "Z": where
             }
+            self._status_frame = CommandFrame(f"*#4*{self._where}*20##")
         elif self._who == "18":
             if self._interface is not None:
                 raise ValueError("Interface cannot be set with WHO=18")
             self._attr_extra_state_attributes = {
                 "P": str(int(where) - 70)
             }
+            self._status_frame = CommandFrame(f"*#18*{self._where}#{self._phase}*71##")
 
         self._on_icon = icon_on
         self._off_icon = icon
@@ -475,10 +483,12 @@ class MyHOMEActuator(MyHOMEEntity, BinarySensorEntity):
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if self._attr_device_class in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._attr_device_class]
 
@@ -487,12 +497,7 @@ class MyHOMEActuator(MyHOMEEntity, BinarySensorEntity):
 
         Only used by the generic entity update service.
         """
-        if self._who == "1":
-            await self._gateway_handler.send_status_request(OWNLightingCommand.status(self._full_where))
-        elif self._who == "4":
-            await self._gateway_handler.send_status_request(OWNHeatingCommand(f"*#4*{self._where}*20##"))
-        elif self._who == "18":
-            await self._gateway_handler.send_status_request(OWNEnergyCommand(f"*#18*{self._where}#{self._phase}*71##"))
+        await self._gateway_handler.send_status_request(self._status_frame)
 
     def handle_event(self, message: OWNEvent):
         """Handle an event message."""
@@ -512,4 +517,4 @@ class MyHOMEActuator(MyHOMEEntity, BinarySensorEntity):
         if self._off_icon is not None and self._on_icon is not None:
             self._attr_icon = self._on_icon if self._attr_is_on else self._off_icon
 
-        self.async_schedule_update_ha_state()
+        self.publish_state()
@@ -0,0 +1,222 @@
+"""Buffers used between the MyHome gateway sessions and Home Assistant."""
+import asyncio
+from collections import deque
+from itertools import islice
+import math
+import time
+from typing import Callable, Dict, Hashable
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
+LANE_COMMAND = 0
+LANE_REFRESH = 1
+LANE_POLL = 2
+
+WAIT_SAMPLES = 1000
+
+
+class FrameQueue:
+    """Bounded FIFO of received frames, handed from the event session reader to the dispatcher.
+
+    When full, `put` waits for room (`block`) or, with `drop_oldest`, discards the
+    oldest queued frame accepted by `droppable`, or the new frame itself if it is
+    droppable and nothing queued is. Frames that cannot be dropped always wait.
+
+    With a `reorder_window`, `get` returns the most urgent frame (lowest `priority`)
+    among the first `reorder_window` queued frames, as long as no earlier frame
+    has the same `ordering_key`, so frames of a device keep their order.
+
+    The waits of the last `WAIT_SAMPLES` frames of each priority are kept, for
+    `wait_percentile` to report their distribution.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        overflow: str = OVERFLOW_BLOCK,
+        droppable: Callable[[object], bool] = None,
+        reorder_window: int = 0,
+        priority: Callable[[object], int] = None,
+        ordering_key: Callable[[object], Hashable] = None,
+    ):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.reorder_window = reorder_window
+        self._droppable = droppable if droppable is not None else lambda frame: False
+        self._priority = priority if priority is not None else lambda frame: 0
+        self._ordering_key = ordering_key if ordering_key is not None else lambda frame: None
+        self._frames = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.high_water_mark = 0
+        self.dropped = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self.reordered = 0
+        self.last_wait_by_priority: Dict[int, float] = {}
+        self.max_wait_by_priority: Dict[int, float] = {}
+        self._wait_samples: Dict[int, deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    async def put(self, frame) -> None:
+        while len(self._frames) >= self.maxsize:
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                if self._drop_oldest():
+                    break
+                if self._droppable(frame):
+                    self.dropped += 1
+                    return
+            self._not_full.clear()
+            await self._not_full.wait()
+        # Priority and ordering key are computed once here rather than on every `get` scan.
+        _key = self._ordering_key(frame) if self.reorder_window > 1 else None
+        self._frames.append((frame, time.monotonic(), self._priority(frame), _key))
+        self.high_water_mark = max(self.high_water_mark, len(self._frames))
+        self._not_empty.set()
+
+    def _drop_oldest(self) -> bool:
+        for _index, (_frame, *_) in enumerate(self._frames):
+            if self._droppable(_frame):
+                del self._frames[_index]
+                self.dropped += 1
+                return True
+        return False
+
+    async def get(self):
+        while not self._frames:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _index = self._next_index()
+        _frame, _queued_at, _priority, _ = self._frames[_index]
+        del self._frames[_index]
+        self.last_wait = time.monotonic() - _queued_at
+        self.max_wait = max(self.max_wait, self.last_wait)
+        self.last_wait_by_priority[_priority] = self.last_wait
+        self.max_wait_by_priority[_priority] = max(self.max_wait_by_priority.get(_priority, 0.0), self.last_wait)
+        if _priority not in self._wait_samples:
+            self._wait_samples[_priority] = deque(maxlen=WAIT_SAMPLES)
+        self._wait_samples[_priority].append(self.last_wait)
+        self._not_full.set()
+        return _frame
+
+    def wait_percentile(self, priority: int, percentile: float) -> float:
+        """Wait in the queue, in seconds, not exceeded by `percentile` % of the recent frames of `priority`."""
+        _samples = sorted(self._wait_samples.get(priority, ()))
+        if not _samples:
+            return 0.0
+        return _samples[max(0, math.ceil(len(_samples) * percentile / 100) - 1)]
+
+    def _next_index(self) -> int:
+        _, _, _best_priority, _key = self._frames[0]
+        if self.reorder_window <= 1 or _best_priority <= 0:
+            return 0
+        _best_index = 0
+        _seen = {_key}
+        for _index, (_, _, _priority, _key) in enumerate(islice(self._frames, 1, self.reorder_window), 1):
+            if _key not in _seen:
+                if _priority < _best_priority:
+                    _best_index, _best_priority = _index, _priority
+                    if _best_priority <= 0:
+                        break
+                _seen.add(_key)
+        if _best_index:
+            self.reordered += 1
+        return _best_index
+
+
+class SendBuffer:
+    """Unbounded queue of messages to send, with one FIFO lane per priority, lane 0 being the most urgent.
+
+    With `aging`, a message is promoted by one lane for every `aging` seconds it
+    has waited when picking the next message, so a steady flow of urgent messages
+    cannot starve the lower lanes.
+    """
+
+    def __init__(self, lanes: int = 3, aging: float = 0):
+        self.aging = aging
+        self._lanes = [deque() for _ in range(lanes)]
+        self._not_empty = asyncio.Event()
+        self.last_wait = [0.0] * lanes
+        self.max_wait = [0.0] * lanes
+
+    def __len__(self) -> int:
+        return sum(len(_lane) for _lane in self._lanes)
+
+    def depth(self, lane: int) -> int:
+        return len(self._lanes[lane])
+
+    def oldest_wait(self) -> float:
+        """Time the oldest queued message has been waiting, in seconds."""
+        _now = time.monotonic()
+        return max((_now - _items[0][1] for _items in self._lanes if _items), default=0.0)
+
+    async def put(self, item, lane: int = 0) -> None:
+        self._lanes[lane].append((item, time.monotonic()))
+        self._not_empty.set()
+
+    def clear(self, *lanes: int) -> list:
+        """Remove and return the messages queued in `lanes`, or in every lane."""
+        _removed = []
+        for _lane in lanes or range(len(self._lanes)):
+            _removed.extend(_item for _item, _ in self._lanes[_lane])
+            self._lanes[_lane].clear()
+        return _removed
+
+    def items(self) -> list:
+        """Messages currently queued, most urgent lane first."""
+        return [_item for _items in self._lanes for _item, _ in _items]
+
+    def pop_least_urgent(self, lane: int = 0):
+        """Remove and return the oldest message of the least urgent non-empty lane from `lane` down, or None."""
+        for _items in reversed(self._lanes[lane:]):
+            if _items:
+                return _items.popleft()[0]
+        return None
+
+    def move(self, item, lane: int) -> bool:
+        """Move a queued message to the end of `lane`, returns False if it is no longer queued."""
+        for _items in self._lanes:
+            for _index, (_item, _) in enumerate(_items):
+                if _item is item:
+                    del _items[_index]
+                    self._lanes[lane].append((item, time.monotonic()))
+                    return True
+        return False
+
+    async def requeue(self, item, lane: int = 0) -> None:
+        """Put back a message taken from the buffer, ahead of the rest of its lane."""
+        self._lanes[lane].appendleft((item, time.monotonic()))
+        self._not_empty.set()
+
+    async def get(self):
+        while not len(self):
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self, accept: Callable[[object], bool] = None):
+        """Remove and return the next message to send, or None if the buffer is empty.
+
+        With `accept`, the next message is left in the buffer and None returned unless it accepts it.
+        """
+        if not len(self):
+            return None
+        _now = time.monotonic()
+        _best_lane = None
+        _best_rank = None
+        for _lane, _items in enumerate(self._lanes):
+            if not _items:
+                continue
+            _rank = _lane - (_now - _items[0][1]) / self.aging if self.aging > 0 else _lane
+            if _best_rank is None or _rank < _best_rank:
+                _best_lane, _best_rank = _lane, _rank
+        if accept is not None and not accept(self._lanes[_best_lane][0][0]):
+            return None
+        _item, _queued_at = self._lanes[_best_lane].popleft()
+        self.last_wait[_best_lane] = _now - _queued_at
+        self.max_wait[_best_lane] = max(self.max_wait[_best_lane], self.last_wait[_best_lane])
+        return _item
@@ -28,6 +28,7 @@ from .const import (
     CONF_DEVICE_MODEL,
     DOMAIN,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 
 
@@ -132,6 +133,7 @@ class DisableCommandButtonEntity(ButtonEntity, MyHOMEEntity):
             if self._interface is not None
             else self._where
         )
+        self._lock_frame = CommandFrame(f"*14*0*{self._full_where}##")
 
         self._attr_extra_state_attributes = {
             "A": where[: len(where) // 2],
@@ -160,7 +162,7 @@ class DisableCommandButtonEntity(ButtonEntity, MyHOMEEntity):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self._gateway_handler.send(f"*14*0*{self._full_where}##")
+        await self._gateway_handler.send(self._lock_frame)
 
 
 class EnableCommandButtonEntity(ButtonEntity, MyHOMEEntity):
@@ -201,6 +203,7 @@ class EnableCommandButtonEntity(ButtonEntity, MyHOMEEntity):
             if self._interface is not None
             else self._where
         )
+        self._unlock_frame = CommandFrame(f"*14*1*{self._full_where}##")
 
         self._attr_extra_state_attributes = {
             "A": where[: len(where) // 2],
@@ -229,4 +232,4 @@ class EnableCommandButtonEntity(ButtonEntity, MyHOMEEntity):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self._gateway_handler.send(f"*14*1*{self._full_where}##")
+        await self._gateway_handler.send(self._unlock_frame)
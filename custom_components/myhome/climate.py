@@ -52,6 +52,7 @@ from .const import (
     DOMAIN,
     LOGGER,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
 
@@ -140,6 +141,7 @@ class MyHOMEClimate(MyHOMEEntity, ClimateEntity):
 
         self._standalone = standalone
         self._central = True if self._where == "#0" else central
+        self._status_frame = CommandFrame(OWNHeatingCommand.status(self._where))
 
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
         self._attr_precision = 0.1
@@ -182,9 +184,7 @@ class MyHOMEClimate(MyHOMEEntity, ClimateEntity):
 
         Only used by the generic entity update service.
         """
-        await self._gateway_handler.send_status_request(
-            OWNHeatingCommand.status(self._where)
-        )
+        await self._gateway_handler.send_status_request(self._status_frame)
 
     @property
     def target_temperature(self) -> float:
@@ -417,4 +417,4 @@ class MyHOMEClimate(MyHOMEEntity, ClimateEntity):
             else:
                 self._attr_hvac_action = HVACAction.IDLE
 
-        self.async_schedule_update_ha_state()
+        self.publish_state()
@@ -8,6 +8,7 @@ from typing import Dict, Optional
 import async_timeout
 from voluptuous import (
     Schema,
+    Optional as OptionalKey,
     Required,
     Coerce,
     All,
@@ -48,9 +49,34 @@ from .const import (
     CONF_WORKER_COUNT,
     CONF_FILE_PATH,
     CONF_GENERATE_EVENTS,
+    CONF_EVENT_WHO_ALLOW,
+    CONF_EVENT_WHO_DENY,
+    CONF_EVENT_TYPE_ALLOW,
+    CONF_EVENT_TYPE_DENY,
+    CONF_EVENT_RATE_LIMIT,
+    CONF_DEDUP_WINDOW,
+    CONF_DEDUP_EXCLUDED_WHO,
+    CONF_BATCH_WINDOW,
+    CONF_BATCH_SIZE,
+    CONF_STATUS_VERIFICATION_DELAY,
+    CONF_RESYNC_RATE,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_INGRESS_QUEUE_SIZE,
+    CONF_INGRESS_OVERFLOW,
+    CONF_TELEMETRY_INTERVAL,
+    CONF_REORDER_WINDOW,
+    CONF_SEND_AGING,
+    CONF_COLLAPSE_COMMANDS,
+    CONF_SEND_MAX_RATE,
+    CONF_OFFLINE_QUEUE_SIZE,
+    CONF_OFFLINE_COMMAND_TTL,
+    CONF_PIPELINE_DEPTH,
+    CONF_WORKER_MAX_COUNT,
     DOMAIN,
     LOGGER,
 )
+from .buffers import OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST
 from .gateway import MyHOMEGatewayHandler
 
 
@@ -385,6 +411,49 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
             self.options[CONF_FILE_PATH] = "/config/myhome.yaml"
         if CONF_GENERATE_EVENTS not in self.options:
             self.options[CONF_GENERATE_EVENTS] = False
+        for _event_filter in [CONF_EVENT_WHO_ALLOW, CONF_EVENT_WHO_DENY, CONF_EVENT_TYPE_ALLOW, CONF_EVENT_TYPE_DENY]:
+            if _event_filter not in self.options:
+                self.options[_event_filter] = ""
+        if CONF_EVENT_RATE_LIMIT not in self.options:
+            self.options[CONF_EVENT_RATE_LIMIT] = 0
+        if CONF_DEDUP_WINDOW not in self.options:
+            self.options[CONF_DEDUP_WINDOW] = 0
+        if CONF_DEDUP_EXCLUDED_WHO not in self.options:
+            self.options[CONF_DEDUP_EXCLUDED_WHO] = "15,25"
+        if CONF_BATCH_WINDOW not in self.options:
+            self.options[CONF_BATCH_WINDOW] = 0
+        if CONF_BATCH_SIZE not in self.options:
+            self.options[CONF_BATCH_SIZE] = 100
+        if CONF_STATUS_VERIFICATION_DELAY not in self.options:
+            self.options[CONF_STATUS_VERIFICATION_DELAY] = 5
+        if CONF_RESYNC_RATE not in self.options:
+            self.options[CONF_RESYNC_RATE] = 5
+        if CONF_KEEPALIVE_INTERVAL not in self.options:
+            self.options[CONF_KEEPALIVE_INTERVAL] = 0
+        if CONF_KEEPALIVE_TIMEOUT not in self.options:
+            self.options[CONF_KEEPALIVE_TIMEOUT] = 10
+        if CONF_INGRESS_QUEUE_SIZE not in self.options:
+            self.options[CONF_INGRESS_QUEUE_SIZE] = 1000
+        if CONF_INGRESS_OVERFLOW not in self.options:
+            self.options[CONF_INGRESS_OVERFLOW] = "block"
+        if CONF_TELEMETRY_INTERVAL not in self.options:
+            self.options[CONF_TELEMETRY_INTERVAL] = 0
+        if CONF_REORDER_WINDOW not in self.options:
+            self.options[CONF_REORDER_WINDOW] = 0
+        if CONF_SEND_AGING not in self.options:
+            self.options[CONF_SEND_AGING] = 5
+        if CONF_COLLAPSE_COMMANDS not in self.options:
+            self.options[CONF_COLLAPSE_COMMANDS] = False
+        if CONF_SEND_MAX_RATE not in self.options:
+            self.options[CONF_SEND_MAX_RATE] = 0
+        if CONF_OFFLINE_QUEUE_SIZE not in self.options:
+            self.options[CONF_OFFLINE_QUEUE_SIZE] = 100
+        if CONF_OFFLINE_COMMAND_TTL not in self.options:
+            self.options[CONF_OFFLINE_COMMAND_TTL] = 30
+        if CONF_PIPELINE_DEPTH not in self.options:
+            self.options[CONF_PIPELINE_DEPTH] = 1
+        if CONF_WORKER_MAX_COUNT not in self.options:
+            self.options[CONF_WORKER_MAX_COUNT] = 1
 
     async def async_step_init(self, user_input=None):  # pylint: disable=unused-argument
         """Manage the MyHome options."""
@@ -402,6 +471,28 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
             self.options.update({CONF_WORKER_COUNT: user_input[CONF_WORKER_COUNT]})
             self.options.update({CONF_FILE_PATH: user_input[CONF_FILE_PATH]})
             self.options.update({CONF_GENERATE_EVENTS: user_input[CONF_GENERATE_EVENTS]})
+            for _event_filter in [CONF_EVENT_WHO_ALLOW, CONF_EVENT_WHO_DENY, CONF_EVENT_TYPE_ALLOW, CONF_EVENT_TYPE_DENY]:
+                self.options.update({_event_filter: user_input.get(_event_filter, "")})
+            self.options.update({CONF_EVENT_RATE_LIMIT: user_input[CONF_EVENT_RATE_LIMIT]})
+            self.options.update({CONF_DEDUP_WINDOW: user_input[CONF_DEDUP_WINDOW]})
+            self.options.update({CONF_DEDUP_EXCLUDED_WHO: user_input.get(CONF_DEDUP_EXCLUDED_WHO, "")})
+            self.options.update({CONF_BATCH_WINDOW: user_input[CONF_BATCH_WINDOW]})
+            self.options.update({CONF_BATCH_SIZE: user_input[CONF_BATCH_SIZE]})
+            self.options.update({CONF_STATUS_VERIFICATION_DELAY: user_input[CONF_STATUS_VERIFICATION_DELAY]})
+            self.options.update({CONF_RESYNC_RATE: user_input[CONF_RESYNC_RATE]})
+            self.options.update({CONF_KEEPALIVE_INTERVAL: user_input[CONF_KEEPALIVE_INTERVAL]})
+            self.options.update({CONF_KEEPALIVE_TIMEOUT: user_input[CONF_KEEPALIVE_TIMEOUT]})
+            self.options.update({CONF_INGRESS_QUEUE_SIZE: user_input[CONF_INGRESS_QUEUE_SIZE]})
+            self.options.update({CONF_INGRESS_OVERFLOW: user_input[CONF_INGRESS_OVERFLOW]})
+            self.options.update({CONF_TELEMETRY_INTERVAL: user_input[CONF_TELEMETRY_INTERVAL]})
+            self.options.update({CONF_REORDER_WINDOW: user_input[CONF_REORDER_WINDOW]})
+            self.options.update({CONF_SEND_AGING: user_input[CONF_SEND_AGING]})
+            self.options.update({CONF_COLLAPSE_COMMANDS: user_input[CONF_COLLAPSE_COMMANDS]})
+            self.options.update({CONF_SEND_MAX_RATE: user_input[CONF_SEND_MAX_RATE]})
+            self.options.update({CONF_OFFLINE_QUEUE_SIZE: user_input[CONF_OFFLINE_QUEUE_SIZE]})
+            self.options.update({CONF_OFFLINE_COMMAND_TTL: user_input[CONF_OFFLINE_COMMAND_TTL]})
+            self.options.update({CONF_PIPELINE_DEPTH: user_input[CONF_PIPELINE_DEPTH]})
+            self.options.update({CONF_WORKER_MAX_COUNT: user_input[CONF_WORKER_MAX_COUNT]})
 
             _data_update = not (self.data[CONF_HOST] == user_input[CONF_ADDRESS] and self.data[CONF_OWN_PASSWORD] == user_input[CONF_OWN_PASSWORD])
             self.data.update({CONF_HOST: user_input[CONF_ADDRESS]})
@@ -443,6 +534,102 @@ class MyhomeOptionsFlowHandler(OptionsFlow):
                         CONF_GENERATE_EVENTS,
                         description={"suggested_value": self.options[CONF_GENERATE_EVENTS]},
                     ): bool,
+                    OptionalKey(
+                        CONF_EVENT_WHO_ALLOW,
+                        description={"suggested_value": self.options[CONF_EVENT_WHO_ALLOW]},
+                    ): str,
+                    OptionalKey(
+                        CONF_EVENT_WHO_DENY,
+                        description={"suggested_value": self.options[CONF_EVENT_WHO_DENY]},
+                    ): str,
+                    OptionalKey(
+                        CONF_EVENT_TYPE_ALLOW,
+                        description={"suggested_value": self.options[CONF_EVENT_TYPE_ALLOW]},
+                    ): str,
+                    OptionalKey(
+                        CONF_EVENT_TYPE_DENY,
+                        description={"suggested_value": self.options[CONF_EVENT_TYPE_DENY]},
+                    ): str,
+                    Required(
+                        CONF_EVENT_RATE_LIMIT,
+                        description={"suggested_value": self.options[CONF_EVENT_RATE_LIMIT]},
+                    ): All(Coerce(float), Range(min=0, max=100)),
+                    Required(
+                        CONF_DEDUP_WINDOW,
+                        description={"suggested_value": self.options[CONF_DEDUP_WINDOW]},
+                    ): All(Coerce(int), Range(min=0, max=5000)),
+                    OptionalKey(
+                        CONF_DEDUP_EXCLUDED_WHO,
+                        description={"suggested_value": self.options[CONF_DEDUP_EXCLUDED_WHO]},
+                    ): str,
+                    Required(
+                        CONF_BATCH_WINDOW,
+                        description={"suggested_value": self.options[CONF_BATCH_WINDOW]},
+                    ): All(Coerce(int), Range(min=0, max=1000)),
+                    Required(
+                        CONF_BATCH_SIZE,
+                        description={"suggested_value": self.options[CONF_BATCH_SIZE]},
+                    ): All(Coerce(int), Range(min=1, max=1000)),
+                    Required(
+                        CONF_STATUS_VERIFICATION_DELAY,
+                        description={"suggested_value": self.options[CONF_STATUS_VERIFICATION_DELAY]},
+                    ): All(Coerce(int), Range(min=0, max=60)),
+                    Required(
+                        CONF_RESYNC_RATE,
+                        description={"suggested_value": self.options[CONF_RESYNC_RATE]},
+                    ): All(Coerce(float), Range(min=0, max=50)),
+                    Required(
+                        CONF_KEEPALIVE_INTERVAL,
+                        description={"suggested_value": self.options[CONF_KEEPALIVE_INTERVAL]},
+                    ): All(Coerce(int), Range(min=0, max=3600)),
+                    Required(
+                        CONF_KEEPALIVE_TIMEOUT,
+                        description={"suggested_value": self.options[CONF_KEEPALIVE_TIMEOUT]},
+                    ): All(Coerce(int), Range(min=1, max=120)),
+                    Required(
+                        CONF_INGRESS_QUEUE_SIZE,
+                        description={"suggested_value": self.options[CONF_INGRESS_QUEUE_SIZE]},
+                    ): All(Coerce(int), Range(min=10, max=100000)),
+                    Required(
+                        CONF_INGRESS_OVERFLOW,
+                        description={"suggested_value": self.options[CONF_INGRESS_OVERFLOW]},
+                    ): In([OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST]),
+                    Required(
+                        CONF_TELEMETRY_INTERVAL,
+                        description={"suggested_value": self.options[CONF_TELEMETRY_INTERVAL]},
+                    ): All(Coerce(float), Range(min=0, max=3600)),
+                    Required(
+                        CONF_REORDER_WINDOW,
+                        description={"suggested_value": self.options[CONF_REORDER_WINDOW]},
+                    ): All(Coerce(int), Range(min=0, max=1000)),
+                    Required(
+                        CONF_SEND_AGING,
+                        description={"suggested_value": self.options[CONF_SEND_AGING]},
+                    ): All(Coerce(float), Range(min=0, max=300)),
+                    Required(
+                        CONF_COLLAPSE_COMMANDS,
+                        description={"suggested_value": self.options[CONF_COLLAPSE_COMMANDS]},
+                    ): bool,
+                    Required(
+                        CONF_SEND_MAX_RATE,
+                        description={"suggested_value": self.options[CONF_SEND_MAX_RATE]},
+                    ): All(Coerce(float), Range(min=0, max=100)),
+                    Required(
+                        CONF_OFFLINE_QUEUE_SIZE,
+                        description={"suggested_value": self.options[CONF_OFFLINE_QUEUE_SIZE]},
+                    ): All(Coerce(int), Range(min=1, max=10000)),
+                    Required(
+                        CONF_OFFLINE_COMMAND_TTL,
+                        description={"suggested_value": self.options[CONF_OFFLINE_COMMAND_TTL]},
+                    ): All(Coerce(int), Range(min=1, max=3600)),
+                    Required(
+                        CONF_PIPELINE_DEPTH,
+                        description={"suggested_value": self.options[CONF_PIPELINE_DEPTH]},
+                    ): All(Coerce(int), Range(min=1, max=32)),
+                    Required(
+                        CONF_WORKER_MAX_COUNT,
+                        description={"suggested_value": self.options[CONF_WORKER_MAX_COUNT]},
+                    ): All(Coerce(int), Range(min=1, max=20)),
                 }
             ),
             errors=errors,
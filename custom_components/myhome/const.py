@@ -27,6 +27,30 @@ CONF_UDN = "UDN"
 CONF_WORKER_COUNT = "command_worker_count"
 CONF_FILE_PATH = "config_file_path"
 CONF_GENERATE_EVENTS = "generate_events"
+CONF_EVENT_WHO_ALLOW = "event_who_allow"
+CONF_EVENT_WHO_DENY = "event_who_deny"
+CONF_EVENT_TYPE_ALLOW = "event_type_allow"
+CONF_EVENT_TYPE_DENY = "event_type_deny"
+CONF_EVENT_RATE_LIMIT = "event_rate_limit"
+CONF_DEDUP_WINDOW = "dedup_window"
+CONF_DEDUP_EXCLUDED_WHO = "dedup_excluded_who"
+CONF_BATCH_WINDOW = "batch_window"
+CONF_BATCH_SIZE = "batch_size"
+CONF_STATUS_VERIFICATION_DELAY = "status_verification_delay"
+CONF_RESYNC_RATE = "resync_rate"
+CONF_KEEPALIVE_INTERVAL = "keepalive_interval"
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+CONF_INGRESS_QUEUE_SIZE = "ingress_queue_size"
+CONF_INGRESS_OVERFLOW = "ingress_overflow"
+CONF_TELEMETRY_INTERVAL = "telemetry_interval"
+CONF_REORDER_WINDOW = "reorder_window"
+CONF_SEND_AGING = "send_aging"
+CONF_COLLAPSE_COMMANDS = "collapse_commands"
+CONF_SEND_MAX_RATE = "send_max_rate"
+CONF_OFFLINE_QUEUE_SIZE = "offline_queue_size"
+CONF_OFFLINE_COMMAND_TTL = "offline_command_ttl"
+CONF_PIPELINE_DEPTH = "command_pipeline_depth"
+CONF_WORKER_MAX_COUNT = "command_worker_max_count"
 CONF_PARENT_ID = "parent_id"
 CONF_WHO = "who"
 CONF_WHERE = "where"
@@ -34,6 +58,7 @@ CONF_PHASE = "phase"
 CONF_BUS_INTERFACE = "interface"
 CONF_ZONE = "zone"
 CONF_DIMMABLE = "dimmable"
+CONF_GROUPS = "groups"
 CONF_GATEWAY = "gateway"
 CONF_DEVICE_CLASS = "class"
 CONF_INVERTED = "inverted"
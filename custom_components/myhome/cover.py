@@ -24,6 +24,7 @@ from .const import (
     CONF_WHO,
     CONF_WHERE,
     CONF_BUS_INTERFACE,
+    CONF_GROUPS,
     CONF_MANUFACTURER,
     CONF_DEVICE_MODEL,
     CONF_ADVANCED_SHUTTER,
@@ -32,6 +33,7 @@ from .const import (
     CONF_SHUTTER_OPENING_TIME,
     CONF_SHUTTER_CLOSING_TIME,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
 from datetime import datetime
@@ -51,6 +53,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             who=_configured_covers[_cover][CONF_WHO],
             where=_configured_covers[_cover][CONF_WHERE],
             interface=_configured_covers[_cover][CONF_BUS_INTERFACE] if CONF_BUS_INTERFACE in _configured_covers[_cover] else None,
+            groups=_configured_covers[_cover][CONF_GROUPS],
             name=_configured_covers[_cover][CONF_NAME],
             entity_name=_configured_covers[_cover][CONF_ENTITY_NAME],
             advanced=_configured_covers[_cover][CONF_ADVANCED_SHUTTER],
@@ -87,6 +90,7 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
         who: str,
         where: str,
         interface: str,
+        groups: list,
         advanced: bool,
         manufacturer: str,
         model: str,
@@ -109,7 +113,12 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
         self._attr_name = entity_name
 
         self._interface = interface
+        self._groups = groups
         self._full_where = f"{self._where}#4#{self._interface}" if self._interface is not None else self._where
+        self._raise_frame = CommandFrame(OWNAutomationCommand.raise_shutter(self._full_where))
+        self._lower_frame = CommandFrame(OWNAutomationCommand.lower_shutter(self._full_where))
+        self._stop_frame = CommandFrame(OWNAutomationCommand.stop_shutter(self._full_where))
+        self._status_frame = CommandFrame(OWNAutomationCommand.status(self._full_where))
         self._attr_opening_time = opening_time
         self._attr_closing_time = closing_time
         self._attr_advanced = advanced
@@ -139,15 +148,15 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
 
         Only used by the generic entity update service.
         """
-        await self._gateway_handler.send_status_request(OWNAutomationCommand.status(self._full_where))
+        await self._gateway_handler.send_status_request(self._status_frame)
 
     async def async_open_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Open the cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.raise_shutter(self._full_where))
+        await self._gateway_handler.send(self._raise_frame)
 
     async def async_close_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Close cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.lower_shutter(self._full_where))
+        await self._gateway_handler.send(self._lower_frame)
 
     async def async_set_cover_position(self, **kwargs):
         """Move the cover to a specific position."""
@@ -158,7 +167,7 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
             elif self._attr_opening_time > 0 or self._attr_closing_time > 0:
 
                 if self._attr_is_closing or self._attr_is_closing:
-                    await self._gateway_handler.send(OWNAutomationCommand.stop_shutter(self._full_where))
+                    await self._gateway_handler.send(self._stop_frame)
 
                 if self._attr_current_cover_position is None:
                     return                
@@ -171,9 +180,9 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
                         "Open -> Required time %s",
                         required_time,
                     )
-                    await self._gateway_handler.send(OWNAutomationCommand.raise_shutter(self._full_where))
+                    await self._gateway_handler.send(self._raise_frame)
                     await asyncio.sleep(required_time)
-                    await self._gateway_handler.send(OWNAutomationCommand.stop_shutter(self._full_where))
+                    await self._gateway_handler.send(self._stop_frame)
                 elif required_move < 0:
                     """ close """
                     required_time = abs(self._attr_closing_time * required_move / 100)
@@ -181,14 +190,14 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
                         "Close -> Required time %s",
                         required_time,
                     )
-                    await self._gateway_handler.send(OWNAutomationCommand.lower_shutter(self._full_where))
+                    await self._gateway_handler.send(self._lower_frame)
                     await asyncio.sleep(required_time)
-                    await self._gateway_handler.send(OWNAutomationCommand.stop_shutter(self._full_where))
+                    await self._gateway_handler.send(self._stop_frame)
 
 
     async def async_stop_cover(self, **kwargs):  # pylint: disable=unused-argument
         """Stop the cover."""
-        await self._gateway_handler.send(OWNAutomationCommand.stop_shutter(self._full_where))
+        await self._gateway_handler.send(self._stop_frame)
 
     def handle_event(self, message: OWNAutomationEvent):
         """Handle an event message."""
@@ -228,4 +237,4 @@ class MyHOMECover(MyHOMEEntity, CoverEntity):
         elif self._attr_current_cover_position is not None:
             self._attr_is_closed = self._attr_current_cover_position == 0
 
-        self.async_schedule_update_ha_state()
\ No newline at end of file
+        self.publish_state()
\ No newline at end of file
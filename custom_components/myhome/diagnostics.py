@@ -0,0 +1,98 @@
+"""Diagnostics support for MyHOME gateways."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .gateway import MyHOMEGatewayHandler
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+
+from .buffers import LANE_COMMAND, LANE_REFRESH, LANE_POLL
+from .const import CONF_ENTITY, DOMAIN
+
+LANES = {"command": LANE_COMMAND, "refresh": LANE_REFRESH, "poll": LANE_POLL}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the connection, event and send path counters of a gateway."""
+    gateway_handler: MyHOMEGatewayHandler = hass.data[DOMAIN][entry.data[CONF_MAC]][CONF_ENTITY]
+    _ingress_queue = gateway_handler.ingress_queue
+    _send_buffer = gateway_handler.send_buffer
+
+    return {
+        "gateway": {
+            "model": gateway_handler.model,
+            "firmware": gateway_handler.firmware,
+        },
+        "connection": {
+            "is_connected": gateway_handler.is_connected,
+            "reconnect_count": gateway_handler.reconnect_count,
+            "total_downtime": gateway_handler.total_downtime,
+            "disconnected_for": time.monotonic() - gateway_handler.disconnected_since
+            if gateway_handler.disconnected_since is not None
+            else None,
+            "keepalive_probes": gateway_handler.keepalive_probes,
+            "stale_sessions": gateway_handler.stale_sessions,
+        },
+        "events": {
+            "events_filtered": gateway_handler.events_filtered,
+            "events_rate_limited": gateway_handler.events_rate_limited,
+            "frames_deduplicated": gateway_handler.frames_deduplicated,
+            "telemetry_conflated": gateway_handler.telemetry_conflated,
+        },
+        "state_writes": {
+            "state_writes_performed": gateway_handler.state_writes_performed,
+            "state_writes_skipped": gateway_handler.state_writes_skipped,
+            "coalesced_refreshes": gateway_handler.coalesced_refreshes,
+        },
+        "ingress_queue": {
+            "depth": len(_ingress_queue),
+            "maxsize": _ingress_queue.maxsize,
+            "high_water_mark": _ingress_queue.high_water_mark,
+            "dropped": _ingress_queue.dropped,
+            "reordered": _ingress_queue.reordered,
+            "last_wait": _ingress_queue.last_wait,
+            "max_wait": _ingress_queue.max_wait,
+            "wait_by_priority": {
+                _priority: {
+                    "last_wait": _last_wait,
+                    "max_wait": _ingress_queue.max_wait_by_priority[_priority],
+                    "p50_wait": _ingress_queue.wait_percentile(_priority, 50),
+                    "p99_wait": _ingress_queue.wait_percentile(_priority, 99),
+                }
+                for _priority, _last_wait in sorted(_ingress_queue.last_wait_by_priority.items())
+            },
+        },
+        "send_buffer": {
+            "depth": len(_send_buffer),
+            "oldest_wait": _send_buffer.oldest_wait(),
+            "lanes": {
+                _name: {
+                    "depth": _send_buffer.depth(_lane),
+                    "last_wait": _send_buffer.last_wait[_lane],
+                    "max_wait": _send_buffer.max_wait[_lane],
+                }
+                for _name, _lane in LANES.items()
+            },
+        },
+        "send_path": {
+            "send_rate": gateway_handler.send_rate,
+            "status_requests_deduplicated": gateway_handler.status_requests_deduplicated,
+            "commands_collapsed": gateway_handler.commands_collapsed,
+            "messages_expired": gateway_handler.messages_expired,
+            "offline_dropped": gateway_handler.offline_dropped,
+            "pipeline_depth": gateway_handler.pipeline_depth,
+        },
+        "workers": {
+            "count": len(gateway_handler.sending_workers),
+            "min_workers": gateway_handler.min_workers,
+            "max_workers": gateway_handler.max_workers,
+            "workers_replaced": gateway_handler.workers_replaced,
+            "worker_health": {_worker_id: dict(_health) for _worker_id, _health in gateway_handler.worker_health.items()},
+        },
+    }
@@ -0,0 +1,56 @@
+"""Command frames prebuilt by the MyHome entities, and what the sender reads from frames."""
+import re
+from typing import Optional, Tuple
+
+COMMAND_FRAME = re.compile(r"^\*(?P<who>\d+)\*(?P<what>\d+)(?:#\d+)*\*(?P<where>#?\d+(?:#\d+)*)##$")
+DIMENSION_WRITING_FRAME = re.compile(r"^\*#(?P<who>\d+)\*(?P<where>#?\d+(?:#\d+)*)\*#(?P<dimension>\d+)")
+
+
+class CommandFrame(str):
+    """A command frame built once, when its entity is created, and sent as is.
+
+    It is encoded for the wire up front and the gateway handler caches what it
+    parses from it, so sending it again neither builds nor parses a message.
+    """
+
+    def __new__(cls, frame):
+        _self = super().__new__(cls, str(frame))
+        _self.encoded = _self.encode()
+        _self.slot = None
+        return _self
+
+
+def command_slot(message) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """Return the (WHO, WHERE) target of a command frame and its kind, None if it must not be collapsed.
+
+    Dimension writes (brightness, shutter position, set points) and lighting
+    on/off/level commands only matter for their latest value. A shutter command
+    only collapses with a repeat of itself, so a stop or a change of direction
+    stays in place. Other commands, such as flashing, are order-sensitive.
+    """
+    if isinstance(message, CommandFrame) and message.slot is not None:
+        return message.slot
+    _frame = str(message)
+    _slot = None, None
+    _match = DIMENSION_WRITING_FRAME.match(_frame)
+    if _match:
+        _slot = (_match.group("who"), _match.group("where")), f"#{_match.group('dimension')}"
+    else:
+        _match = COMMAND_FRAME.match(_frame)
+        if _match:
+            _who, _what = _match.group("who"), _match.group("what")
+            if _who == "1":
+                _kind = "state" if int(_what) <= 10 else None
+            elif _who == "2":
+                _kind = _what
+            else:
+                _kind = None
+            _slot = (_match.group("who"), _match.group("where")), _kind
+    if isinstance(message, CommandFrame):
+        message.slot = _slot
+    return _slot
+
+
+def encode_frame(message) -> bytes:
+    """Return the bytes to write for a frame, without encoding a prebuilt one again."""
+    return message.encoded if isinstance(message, CommandFrame) else str(message).encode()
@@ -1,6 +1,10 @@
 """Code to handle a MyHome Gateway."""
 import asyncio
-from typing import Dict, List
+from collections import OrderedDict, deque
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple, Union
 
 from homeassistant.const import (
     CONF_ENTITIES,
@@ -16,20 +20,17 @@ from homeassistant.components.switch import (
     SwitchDeviceClass,
     DOMAIN as SWITCH,
 )
-from homeassistant.components.button import DOMAIN as BUTTON
 from homeassistant.components.cover import DOMAIN as COVER
-from homeassistant.components.binary_sensor import (
-    BinarySensorDeviceClass,
-    DOMAIN as BINARY_SENSOR,
-)
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    DOMAIN as SENSOR,
-)
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.components.climate import DOMAIN as CLIMATE
 
 from OWNd.connection import OWNSession, OWNEventSession, OWNCommandSession, OWNGateway
 from OWNd.message import (
+    MESSAGE_TYPE_ILLUMINANCE,
+    MESSAGE_TYPE_MAIN_HUMIDITY,
+    MESSAGE_TYPE_MAIN_TEMPERATURE,
+    MESSAGE_TYPE_SECONDARY_TEMPERATURE,
     OWNMessage,
     OWNLightingEvent,
     OWNLightingCommand,
@@ -62,17 +63,121 @@ from .const import (
     DOMAIN,
     LOGGER,
 )
+from .buffers import FrameQueue, SendBuffer, LANE_COMMAND, LANE_REFRESH, LANE_POLL
+from .frames import command_slot, encode_frame
 from .myhome_device import MyHOMEEntity
-from .button import (
-    DisableCommandButtonEntity,
-    EnableCommandButtonEntity,
-)
+from .throttle import AdaptiveTokenBucket, TokenBucket
+
+MAX_RECENT_FRAMES = 512
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 300
+RECONNECT_STABLE_TIME = 60
+KEEPALIVE_PROBE = "*#13**0##"
+ACK_FRAME = "*#*1##"
+NACK_FRAME = "*#*0##"
+BUSY_FRAME = "*#*6##"
+SEND_TIMEOUT = 5
+SEND_RETRIES = 2
+SEND_RETRY_DELAY = 0.5
+SEND_TARGET_RTT = 1
+WORKER_SCALE_UP_DEPTH = 10
+WORKER_SCALE_UP_WAIT = 1
+WORKER_IDLE_TIMEOUT = 60
+WORKER_MAX_RECONNECTS = 5
+SHUTDOWN_DRAIN_TIMEOUT = 0.5
+SHUTDOWN_CANCEL_TIMEOUT = 0.5
+OFFLINE_STATUS_REQUEST_TTL = 5
+OFFLINE_REPLAY_RATE = 5
+OUTCOME_ACK = "ack"
+OUTCOME_NACK = "nack"
+OUTCOME_BUSY = "busy"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+OUTCOME_CLOSED = "closed"
+OUTCOME_EXPIRED = "expired"
+OUTCOME_DROPPED = "dropped"
+AREA_WHERES = ["00", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10"]
+
+
+class SendResult(NamedTuple):
+    """Outcome of a command sent to the gateway, with the round-trip time of its last attempt."""
+
+    outcome: str
+    rtt: float
+    attempts: int
+
+
+def _parse_filter(value: str) -> frozenset:
+    """Split a comma separated option into a set of values."""
+    return frozenset(_item.strip() for _item in (value or "").split(",") if _item.strip())
+
+
+def _is_congested(task: dict, outcome: str, rtt: float) -> bool:
+    """Tell whether the reply to a frame shows a congested gateway.
+
+    NACKs, busy replies and timeouts always do. A slow ACK only does for a command:
+    a status request is acknowledged after the state of every device it addresses,
+    so its round trip grows with the number of devices rather than with congestion.
+    """
+    if outcome != OUTCOME_ACK:
+        return True
+    return not task["is_status_request"] and rtt > SEND_TARGET_RTT
+
+
+def _dispatch_priority(message) -> int:
+    """Rank frames for dispatch: lighting, automation and CEN first, heating next, measurements last."""
+    if _is_telemetry(message):
+        return 3
+    if isinstance(message, (OWNLightingEvent, OWNAutomationEvent, OWNCENEvent, OWNCENPlusEvent)):
+        return 0
+    if isinstance(message, (OWNHeatingEvent, OWNHeatingCommand)):
+        return 2
+    return 1
+
+
+def _is_telemetry(message) -> bool:
+    """Check if a message is a periodic measurement that a newer reading supersedes."""
+    if isinstance(message, OWNEnergyEvent):
+        return True
+    if isinstance(message, OWNHeatingEvent):
+        return message.message_type in (MESSAGE_TYPE_MAIN_TEMPERATURE, MESSAGE_TYPE_SECONDARY_TEMPERATURE, MESSAGE_TYPE_MAIN_HUMIDITY)
+    if isinstance(message, OWNLightingEvent):
+        return message.message_type == MESSAGE_TYPE_ILLUMINANCE
+    return False
 
 
 class MyHOMEGatewayHandler:
     """Manages a single MyHOME Gateway."""
 
-    def __init__(self, hass, config_entry, generate_events=False):
+    def __init__(
+        self,
+        hass,
+        config_entry,
+        generate_events=False,
+        batch_window=0,
+        batch_size=100,
+        status_verification_delay=5,
+        resync_rate=5,
+        keepalive_interval=0,
+        keepalive_timeout=10,
+        ingress_queue_size=1000,
+        ingress_overflow="block",
+        telemetry_interval=0,
+        reorder_window=0,
+        send_aging=5,
+        collapse_commands=False,
+        send_max_rate=0,
+        offline_queue_size=100,
+        offline_command_ttl=30,
+        command_pipeline_depth=1,
+        event_who_allow="",
+        event_who_deny="",
+        event_type_allow="",
+        event_type_deny="",
+        event_rate_limit=0,
+        dedup_window=0,
+        dedup_excluded_who="15,25",
+    ):
         build_info = {
             "address": config_entry.data[CONF_HOST],
             "port": config_entry.data[CONF_PORT],
@@ -91,13 +196,97 @@ class MyHOMEGatewayHandler:
         self.hass = hass
         self.config_entry = config_entry
         self.generate_events = generate_events
+        self.event_who_allow = _parse_filter(event_who_allow)
+        self.event_who_deny = _parse_filter(event_who_deny)
+        self.event_type_allow = _parse_filter(event_type_allow)
+        self.event_type_deny = _parse_filter(event_type_deny)
+        self.event_rate_limit = event_rate_limit
+        self._event_buckets: Dict[Tuple, TokenBucket] = {}
+        self.events_filtered = 0
+        self.events_rate_limited = 0
+        self.dedup_window = dedup_window
+        self.dedup_excluded_who = _parse_filter(dedup_excluded_who)
+        self._recent_frames: OrderedDict = OrderedDict()
+        self.frames_deduplicated = 0
+        self.telemetry_interval = telemetry_interval
+        self._telemetry_dispatched: Dict[Tuple, float] = {}
+        self._conflated_messages: Dict[Tuple, OWNMessage] = {}
+        self._conflation_timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        self.telemetry_conflated = 0
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.status_verification_delay = status_verification_delay
+        self.resync_rate = resync_rate
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_timeout = keepalive_timeout
+        self.last_frame_at: float = None
+        self.keepalive_probes = 0
+        self.stale_sessions = 0
         self.gateway = OWNGateway(build_info)
         self._terminate_listener = False
         self._terminate_sender = False
+        self._closing = False
         self.is_connected = False
+        self.reconnect_count = 0
+        self.total_downtime = 0.0
+        self.disconnected_since: float = None
+        self._resync_task: asyncio.tasks.Task = None
         self.listening_worker: asyncio.tasks.Task = None
-        self.sending_workers: List[asyncio.tasks.Task] = []
-        self.send_buffer = asyncio.Queue()
+        self.dispatching_worker: asyncio.tasks.Task = None
+        self.ingress_queue = FrameQueue(
+            ingress_queue_size,
+            overflow=ingress_overflow,
+            droppable=_is_telemetry,
+            reorder_window=reorder_window,
+            priority=_dispatch_priority,
+            ordering_key=lambda message: getattr(message, "entity", None),
+        )
+        self.sending_workers: Dict[int, asyncio.tasks.Task] = {}
+        self.min_workers = 1
+        self.max_workers = 1
+        self._next_worker_id = 0
+        self.worker_health: Dict[int, dict] = {}
+        self.workers_replaced = 0
+        self.send_buffer = SendBuffer(aging=send_aging)
+        self._pending_status_requests: Dict[str, dict] = {}
+        self.status_requests_deduplicated = 0
+        self.collapse_commands = collapse_commands
+        self._queued_commands: Dict[Tuple[str, str], dict] = {}
+        self.commands_collapsed = 0
+        self.send_limiter = AdaptiveTokenBucket(send_max_rate) if send_max_rate > 0 else None
+        self.offline_queue_size = offline_queue_size
+        self.offline_command_ttl = offline_command_ttl
+        self._online = asyncio.Event()
+        self._online.set()
+        self._replay_remaining = 0
+        self._replay_limiter = TokenBucket(OFFLINE_REPLAY_RATE, capacity=1)
+        self.messages_expired = 0
+        self.offline_dropped = 0
+        self.pipeline_depth = command_pipeline_depth
+        self._routed_entities: Dict[str, Dict[str, MyHOMEEntity]] = {}
+        self._entity_routes: Dict[str, Tuple[Callable[[OWNMessage], None], ...]] = {}
+        self._scope_members: Dict[Tuple[str, Union[int, str, None]], Dict[str, MyHOMEEntity]] = {}
+        self._scope_routes: Dict[Tuple[str, Union[int, str, None]], Tuple[Callable[[OWNMessage], None], ...]] = {}
+        self._message_handlers: Dict[type, Callable[[OWNMessage], Awaitable[None]]] = {
+            OWNMessage: self._handle_unsupported_message,
+            OWNEnergyEvent: self._handle_energy_event,
+            OWNLightingEvent: self._handle_lighting_event,
+            OWNAutomationEvent: self._handle_automation_event,
+            OWNDryContactEvent: self._handle_entity_event,
+            OWNAuxEvent: self._handle_entity_event,
+            OWNHeatingEvent: self._handle_entity_event,
+            OWNHeatingCommand: self._handle_heating_command,
+            OWNCENPlusEvent: self._handle_cenplus_event,
+            OWNCENEvent: self._handle_cen_event,
+            OWNGatewayEvent: self._handle_gateway_message,
+            OWNGatewayCommand: self._handle_gateway_message,
+        }
+        self._resolved_handlers: Dict[type, Callable[[OWNMessage], Awaitable[None]]] = {}
+        self._pending_state_writes: Dict[str, MyHOMEEntity] = None
+        self.state_writes_performed = 0
+        self.state_writes_skipped = 0
+        self._pending_refreshes: Dict[str, asyncio.TimerHandle] = {}
+        self.coalesced_refreshes = 0
 
     @property
     def mac(self) -> str:
@@ -127,275 +316,969 @@ class MyHOMEGatewayHandler:
     def firmware(self) -> str:
         return self.gateway.firmware
 
+    @property
+    def send_rate(self) -> Optional[float]:
+        """Current number of frames per second allowed on the command path, None if not limited."""
+        return self.send_limiter.rate if self.send_limiter is not None else None
+
     async def test(self) -> Dict:
         return await OWNSession(gateway=self.gateway, logger=LOGGER).test_connection()
 
-    async def listening_loop(self):
-        self._terminate_listener = False
+    def register_entity(self, device_id: str, entity: MyHOMEEntity) -> None:
+        """Add an entity to the routing indexes used to dispatch incoming events."""
+        self._add_route(self._routed_entities, self._entity_routes, device_id, entity)
+        for _scope in self._entity_scopes(entity):
+            self._add_route(self._scope_members, self._scope_routes, _scope, entity)
 
-        LOGGER.debug("%s Creating listening worker.", self.log_id)
+    def unregister_entity(self, device_id: str, entity: MyHOMEEntity) -> None:
+        """Remove an entity from the routing indexes."""
+        self._remove_route(self._routed_entities, self._entity_routes, device_id, entity)
+        for _scope in self._entity_scopes(entity):
+            self._remove_route(self._scope_members, self._scope_routes, _scope, entity)
 
-        _event_session = OWNEventSession(gateway=self.gateway, logger=LOGGER)
-        await _event_session.connect()
-        self.is_connected = True
+    @staticmethod
+    def _add_route(members: Dict, routes: Dict, key, entity: MyHOMEEntity) -> None:
+        members.setdefault(key, {})[entity.unique_id] = entity
+        routes[key] = tuple(_entity.handle_event for _entity in members[key].values())
 
-        while not self._terminate_listener:
-            message = await _event_session.get_next()
-            LOGGER.debug("%s Message received: `%s`", self.log_id, message)
-
-            # Workaround due to how the OWNd library creates the entity ID,
-            # replacing zone=0 with zone=where_param
-            if isinstance(message, OWNHeatingEvent) and message.where == "0":
-                message._zone = 0
-
-            if self.generate_events:
-                if isinstance(message, OWNMessage):
-                    _event_content = {"gateway": str(self.gateway.host)}
-                    _event_content.update(message.event_content)
-                    self.hass.bus.async_fire("myhome_message_event", _event_content)
-                else:
-                    self.hass.bus.async_fire("myhome_message_event", {"gateway": str(self.gateway.host), "message": str(message)})
+    @staticmethod
+    def _remove_route(members: Dict, routes: Dict, key, entity: MyHOMEEntity) -> None:
+        if key not in members:
+            return
+        members[key].pop(entity.unique_id, None)
+        if members[key]:
+            routes[key] = tuple(_entity.handle_event for _entity in members[key].values())
+        else:
+            del members[key]
+            del routes[key]
 
-            if not isinstance(message, OWNMessage):
-                LOGGER.warning(
-                    "%s Data received is not a message: `%s`",
+    @staticmethod
+    def _entity_scopes(entity: MyHOMEEntity) -> Tuple[Tuple[str, Union[int, str, None]], ...]:
+        """Return the general (None), area (int) and group ("#N") scopes an entity is reached by.
+
+        Only lights, switches and covers are indexed. General and area scopes
+        only cover the local bus; entities configured on a general WHERE receive
+        general frames through the routing index, and group WHEREs are not
+        covered by area or general commands. Group scopes come from the
+        device's configured group membership.
+        """
+        if entity._platform not in (LIGHT, SWITCH, COVER):
+            return ()
+        _scopes = tuple((entity._who, _group) for _group in entity._groups)
+        _where = entity._where
+        if getattr(entity, "_interface", None) is not None or _where == "0" or _where.startswith("#"):
+            return _scopes
+        if _where in AREA_WHERES:
+            return _scopes + ((entity._who, None),)
+        return _scopes + ((entity._who, None), (entity._who, int(_where[: len(_where) // 2])))
+
+    def _dispatch_to_entities(self, message: OWNMessage) -> None:
+        for _handle_event in self._entity_routes.get(message.entity, ()):
+            try:
+                _handle_event(message)
+            except:
+                LOGGER.error(
+                    "%s Error handling event `%s`",
                     self.log_id,
                     message,
                 )
-            elif isinstance(message, OWNEnergyEvent):
-                if SENSOR in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS] and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR]:
-                    for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES]:
-                        if isinstance(
-                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity],
-                            MyHOMEEntity,
-                        ):
-                            try:
-                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][SENSOR][message.entity][CONF_ENTITIES][_entity].handle_event(message)
-                            except:
-                                LOGGER.error(
-                                    "%s Error handling sensor event `%s`",
-                                    self.log_id,
-                                    message,
-                                )
-                elif BINARY_SENSOR in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS] and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][BINARY_SENSOR]:
-                    for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][BINARY_SENSOR][message.entity][CONF_ENTITIES]:
-                        if isinstance(
-                            self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][BINARY_SENSOR][message.entity][CONF_ENTITIES][_entity],
-                            MyHOMEEntity,
-                        ):
-                            try:
-                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][BINARY_SENSOR][message.entity][CONF_ENTITIES][_entity].handle_event(message)
-                            except:
-                                LOGGER.error(
-                                    "%s Error handling binary sensor event `%s`",
-                                    self.log_id,
-                                    message,
-                                )
-                else:
-                    continue
-            elif (
-                isinstance(message, OWNLightingEvent)
-                or isinstance(message, OWNAutomationEvent)
-                or isinstance(message, OWNDryContactEvent)
-                or isinstance(message, OWNAuxEvent)
-                or isinstance(message, OWNHeatingEvent)
-            ):
-                if not message.is_translation:
-                    is_event = False
-                    if isinstance(message, OWNLightingEvent):
-                        if message.is_general:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_general_light_event",
-                                {"message": str(message), "event": event},
-                            )
-                            await asyncio.sleep(0.1)
-                            await self.send_status_request(OWNLightingCommand.status("0"))
-                        elif message.is_area:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_area_light_event",
-                                {
-                                    "message": str(message),
-                                    "area": message.area,
-                                    "event": event,
-                                },
-                            )
-                            await asyncio.sleep(0.1)
-                            await self.send_status_request(OWNLightingCommand.status(message.area))
-                        elif message.is_group:
-                            is_event = True
-                            event = "on" if message.is_on else "off"
-                            self.hass.bus.async_fire(
-                                "myhome_group_light_event",
-                                {
-                                    "message": str(message),
-                                    "group": message.group,
-                                    "event": event,
-                                },
-                            )
-                    elif isinstance(message, OWNAutomationEvent):
-                        if message.is_general:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_general_automation_event",
-                                {"message": str(message), "event": event},
-                            )
-                        elif message.is_area:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_area_automation_event",
-                                {
-                                    "message": str(message),
-                                    "area": message.area,
-                                    "event": event,
-                                },
-                            )
-                        elif message.is_group:
-                            is_event = True
-                            if message.is_opening and not message.is_closing:
-                                event = "open"
-                            elif message.is_closing and not message.is_opening:
-                                event = "close"
-                            else:
-                                event = "stop"
-                            self.hass.bus.async_fire(
-                                "myhome_group_automation_event",
-                                {
-                                    "message": str(message),
-                                    "group": message.group,
-                                    "event": event,
-                                },
-                            )
-                    if not is_event:
-                        if isinstance(message, OWNLightingEvent) and message.brightness_preset:
-                            if message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT] and isinstance(
-                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT],
-                                MyHOMEEntity,
-                            ):
-                                await self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT].async_update()
-                        else:
-                            for _platform in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS]:
-                                if _platform != BUTTON and message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform]:
-                                    for _entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES]:
-                                        if (
-                                            isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                MyHOMEEntity,
-                                            )
-                                            and not isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                DisableCommandButtonEntity,
-                                            )
-                                            and not isinstance(
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
-                                                EnableCommandButtonEntity,
-                                            )
-                                        ):
-                                            try:
-                                                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity].handle_event(message)
-                                            except:
-                                                LOGGER.error(
-                                                    "%s Error handling event `%s`",
-                                                    self.log_id,
-                                                    message,
-                                                )
 
-                else:
-                    LOGGER.debug(
-                        "%s Ignoring translation message `%s`",
-                        self.log_id,
-                        message,
-                    )
-            elif isinstance(message, OWNHeatingCommand) and message.dimension is not None and message.dimension == 14:
-                where = message.where[1:] if message.where.startswith("#") else message.where
-                LOGGER.debug(
-                    "%s Received heating command, sending query to zone %s",
+    def _dispatch_to_scope(self, message: OWNMessage, who: str, scope: Union[int, str, None]) -> None:
+        """Apply a general (None), area (int) or group ("#N") command to every entity it reaches."""
+        self._dispatch_to_entities(message)
+        for _handle_event in self._scope_routes.get((who, scope), ()):
+            try:
+                _handle_event(message)
+            except:
+                LOGGER.error(
+                    "%s Error handling event `%s`",
                     self.log_id,
-                    where,
-                )
-                await self.send_status_request(OWNHeatingCommand.status(where))
-            elif isinstance(message, OWNCENPlusEvent):
-                event = None
-                if message.is_short_pressed:
-                    event = CONF_SHORT_PRESS
-                elif message.is_held or message.is_still_held:
-                    event = CONF_LONG_PRESS
-                elif message.is_released:
-                    event = CONF_LONG_RELEASE
-                else:
-                    event = None
-                self.hass.bus.async_fire(
-                    "myhome_cenplus_event",
-                    {
-                        "object": int(message.object),
-                        "pushbutton": int(message.push_button),
-                        "event": event,
-                    },
+                    message,
                 )
-                LOGGER.info(
-                    "%s %s",
+
+    @property
+    def is_batching(self) -> bool:
+        return self._pending_state_writes is not None
+
+    def defer_state_write(self, entity: MyHOMEEntity) -> None:
+        """Queue a state write for the end of the current batch."""
+        self._pending_state_writes[entity.unique_id] = entity
+
+    def _flush_state_writes(self) -> None:
+        _pending_state_writes = self._pending_state_writes
+        self._pending_state_writes = None
+        for _entity in _pending_state_writes.values():
+            try:
+                if _entity.state_changed():
+                    _entity.async_write_ha_state()
+            except:
+                LOGGER.error(
+                    "%s Error writing state of `%s`",
                     self.log_id,
-                    message.human_readable_log,
-                )
-            elif isinstance(message, OWNCENEvent):
-                event = None
-                if message.is_pressed:
-                    event = CONF_SHORT_PRESS
-                elif message.is_released_after_short_press:
-                    event = CONF_SHORT_RELEASE
-                elif message.is_held:
-                    event = CONF_LONG_PRESS
-                elif message.is_released_after_long_press:
-                    event = CONF_LONG_RELEASE
-                else:
-                    event = None
-                self.hass.bus.async_fire(
-                    "myhome_cen_event",
-                    {
-                        "object": int(message.object),
-                        "pushbutton": int(message.push_button),
-                        "event": event,
-                    },
+                    _entity.entity_id,
                 )
-                LOGGER.info(
-                    "%s %s",
+
+    def schedule_refresh(self, message: OWNCommand, delay: float = 0.1) -> None:
+        """Queue a status request to be sent after `delay` seconds without blocking the caller.
+
+        Identical requests scheduled while one is already pending are merged into it.
+        """
+        _key = str(message)
+        if _key in self._pending_refreshes:
+            self.coalesced_refreshes += 1
+            LOGGER.debug(
+                "%s Refresh `%s` already pending, coalescing.",
+                self.log_id,
+                message,
+            )
+            return
+        self._pending_refreshes[_key] = self.hass.loop.call_later(delay, self._send_refresh, _key, message)
+
+    def _send_refresh(self, key: str, message: OWNCommand) -> None:
+        del self._pending_refreshes[key]
+        self.hass.async_create_task(self.send_status_request(message, lane=LANE_REFRESH))
+
+    def _cancel_refreshes(self) -> None:
+        for _timer in self._pending_refreshes.values():
+            _timer.cancel()
+        self._pending_refreshes.clear()
+
+    def register_message_handler(self, message_type: type, handler: Callable[[OWNMessage], Awaitable[None]]) -> None:
+        """Route every message of `message_type` (and its subclasses) to `handler`."""
+        self._message_handlers[message_type] = handler
+        self._resolved_handlers.clear()
+
+    def _resolve_message_handler(self, message_type: type) -> Callable[[OWNMessage], Awaitable[None]]:
+        for _type in message_type.__mro__:
+            if _type in self._message_handlers:
+                handler = self._message_handlers[_type]
+                break
+        else:
+            handler = self._handle_non_message
+        self._resolved_handlers[message_type] = handler
+        return handler
+
+    async def _handle_non_message(self, message) -> None:
+        LOGGER.warning(
+            "%s Data received is not a message: `%s`",
+            self.log_id,
+            message,
+        )
+
+    async def _handle_unsupported_message(self, message: OWNMessage) -> None:
+        LOGGER.info(
+            "%s Unsupported message type: `%s`",
+            self.log_id,
+            message,
+        )
+
+    async def _handle_energy_event(self, message: OWNEnergyEvent) -> None:
+        self._dispatch_to_entities(message)
+
+    async def _handle_entity_event(self, message: OWNMessage) -> None:
+        if message.is_translation:
+            LOGGER.debug(
+                "%s Ignoring translation message `%s`",
+                self.log_id,
+                message,
+            )
+            return
+        self._dispatch_to_entities(message)
+
+    async def _handle_lighting_event(self, message: OWNLightingEvent) -> None:
+        if message.is_translation:
+            LOGGER.debug(
+                "%s Ignoring translation message `%s`",
+                self.log_id,
+                message,
+            )
+        elif message.is_general:
+            event = "on" if message.is_on else "off"
+            self.hass.bus.async_fire(
+                "myhome_general_light_event",
+                {"message": str(message), "event": event},
+            )
+            self._dispatch_to_scope(message, "1", None)
+            if self.status_verification_delay > 0:
+                self.schedule_refresh(OWNLightingCommand.status("0"), delay=self.status_verification_delay)
+        elif message.is_area:
+            event = "on" if message.is_on else "off"
+            self.hass.bus.async_fire(
+                "myhome_area_light_event",
+                {
+                    "message": str(message),
+                    "area": message.area,
+                    "event": event,
+                },
+            )
+            self._dispatch_to_scope(message, "1", int(message.area))
+            if self.status_verification_delay > 0:
+                self.schedule_refresh(OWNLightingCommand.status(message.area), delay=self.status_verification_delay)
+        elif message.is_group:
+            event = "on" if message.is_on else "off"
+            self.hass.bus.async_fire(
+                "myhome_group_light_event",
+                {
+                    "message": str(message),
+                    "group": message.group,
+                    "event": event,
+                },
+            )
+            self._dispatch_to_scope(message, "1", f"#{int(str(message.group).lstrip('#'))}")
+        elif message.brightness_preset:
+            if message.entity in self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT] and isinstance(
+                self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT],
+                MyHOMEEntity,
+            ):
+                await self.hass.data[DOMAIN][self.mac][CONF_PLATFORMS][LIGHT][message.entity][CONF_ENTITIES][LIGHT].async_update()
+        else:
+            self._dispatch_to_entities(message)
+
+    async def _handle_automation_event(self, message: OWNAutomationEvent) -> None:
+        if message.is_translation:
+            LOGGER.debug(
+                "%s Ignoring translation message `%s`",
+                self.log_id,
+                message,
+            )
+            return
+        if not (message.is_general or message.is_area or message.is_group):
+            self._dispatch_to_entities(message)
+            return
+
+        if message.is_opening and not message.is_closing:
+            event = "open"
+        elif message.is_closing and not message.is_opening:
+            event = "close"
+        else:
+            event = "stop"
+
+        if message.is_general:
+            self.hass.bus.async_fire(
+                "myhome_general_automation_event",
+                {"message": str(message), "event": event},
+            )
+            self._dispatch_to_scope(message, "2", None)
+        elif message.is_area:
+            self.hass.bus.async_fire(
+                "myhome_area_automation_event",
+                {
+                    "message": str(message),
+                    "area": message.area,
+                    "event": event,
+                },
+            )
+            self._dispatch_to_scope(message, "2", int(message.area))
+        else:
+            self.hass.bus.async_fire(
+                "myhome_group_automation_event",
+                {
+                    "message": str(message),
+                    "group": message.group,
+                    "event": event,
+                },
+            )
+            self._dispatch_to_scope(message, "2", f"#{int(str(message.group).lstrip('#'))}")
+
+    async def _handle_heating_command(self, message: OWNHeatingCommand) -> None:
+        if message.dimension is not None and message.dimension == 14:
+            where = message.where[1:] if message.where.startswith("#") else message.where
+            LOGGER.debug(
+                "%s Received heating command, sending query to zone %s",
+                self.log_id,
+                where,
+            )
+            await self.send_status_request(OWNHeatingCommand.status(where), lane=LANE_REFRESH)
+        else:
+            await self._handle_unsupported_message(message)
+
+    async def _handle_cenplus_event(self, message: OWNCENPlusEvent) -> None:
+        event = None
+        if message.is_short_pressed:
+            event = CONF_SHORT_PRESS
+        elif message.is_held or message.is_still_held:
+            event = CONF_LONG_PRESS
+        elif message.is_released:
+            event = CONF_LONG_RELEASE
+        else:
+            event = None
+        self.hass.bus.async_fire(
+            "myhome_cenplus_event",
+            {
+                "object": int(message.object),
+                "pushbutton": int(message.push_button),
+                "event": event,
+            },
+        )
+        LOGGER.info(
+            "%s %s",
+            self.log_id,
+            message.human_readable_log,
+        )
+
+    async def _handle_cen_event(self, message: OWNCENEvent) -> None:
+        event = None
+        if message.is_pressed:
+            event = CONF_SHORT_PRESS
+        elif message.is_released_after_short_press:
+            event = CONF_SHORT_RELEASE
+        elif message.is_held:
+            event = CONF_LONG_PRESS
+        elif message.is_released_after_long_press:
+            event = CONF_LONG_RELEASE
+        else:
+            event = None
+        self.hass.bus.async_fire(
+            "myhome_cen_event",
+            {
+                "object": int(message.object),
+                "pushbutton": int(message.push_button),
+                "event": event,
+            },
+        )
+        LOGGER.info(
+            "%s %s",
+            self.log_id,
+            message.human_readable_log,
+        )
+
+    async def _handle_gateway_message(self, message: OWNMessage) -> None:
+        LOGGER.info(
+            "%s %s",
+            self.log_id,
+            message.human_readable_log,
+        )
+
+    def _should_fire_message_event(self, message) -> bool:
+        """Apply the WHO/message type filters and the per-key rate limit to `myhome_message_event`."""
+        if isinstance(message, OWNMessage):
+            _who = str(message.who)
+            _type = str(getattr(message, "message_type", None))
+            _key = (getattr(message, "entity", None), _type)
+        else:
+            _who = _type = None
+            _key = (None, None)
+
+        if (
+            (self.event_who_allow and _who not in self.event_who_allow)
+            or _who in self.event_who_deny
+            or (self.event_type_allow and _type not in self.event_type_allow)
+            or _type in self.event_type_deny
+        ):
+            self.events_filtered += 1
+            return False
+
+        if self.event_rate_limit > 0:
+            _bucket = self._event_buckets.get(_key)
+            if _bucket is None:
+                _bucket = self._event_buckets[_key] = TokenBucket(self.event_rate_limit)
+            if not _bucket.consume():
+                self.events_rate_limited += 1
+                return False
+
+        return True
+
+    def _is_duplicate(self, message) -> bool:
+        """Check if the same frame was already received for this entity within the dedup window."""
+        if not isinstance(message, OWNMessage) or str(message.who) in self.dedup_excluded_who:
+            return False
+
+        _now = time.monotonic()
+        _key = (type(message), getattr(message, "entity", None), getattr(message, "message_type", None))
+        _frame = str(message)
+        _last_seen = self._recent_frames.get(_key)
+        self._recent_frames[_key] = (_frame, _now)
+        self._recent_frames.move_to_end(_key)
+        if len(self._recent_frames) > MAX_RECENT_FRAMES:
+            self._recent_frames.popitem(last=False)
+
+        return _last_seen is not None and _last_seen[0] == _frame and _now - _last_seen[1] < self.dedup_window / 1000
+
+    def _conflate(self, message: OWNMessage) -> bool:
+        """Hold back a measurement received less than `telemetry_interval` after the previous one.
+
+        Only the latest held measurement of each entity and message type is
+        kept, and it is delivered once the interval has elapsed. Returns
+        whether the message was held back.
+        """
+        _key = (message.entity, message.message_type)
+        if _key in self._conflation_timers:
+            self.telemetry_conflated += 1
+            self._conflated_messages[_key] = message
+            return True
+
+        _now = time.monotonic()
+        _last_dispatched = self._telemetry_dispatched.get(_key)
+        if _last_dispatched is None or _now - _last_dispatched >= self.telemetry_interval:
+            self._telemetry_dispatched[_key] = _now
+            return False
+
+        self._conflated_messages[_key] = message
+        self._conflation_timers[_key] = self.hass.loop.call_later(
+            _last_dispatched + self.telemetry_interval - _now, self._release_conflated, _key
+        )
+        return True
+
+    def _release_conflated(self, key: Tuple) -> None:
+        del self._conflation_timers[key]
+        self._telemetry_dispatched[key] = time.monotonic()
+        self.hass.async_create_task(self._deliver_message(self._conflated_messages.pop(key)))
+
+    def _cancel_conflation(self) -> None:
+        for _timer in self._conflation_timers.values():
+            _timer.cancel()
+        self._conflation_timers.clear()
+        self._conflated_messages.clear()
+
+    async def _process_message(self, message) -> None:
+        LOGGER.debug("%s Message received: `%s`", self.log_id, message)
+
+        if self.dedup_window > 0 and self._is_duplicate(message):
+            self.frames_deduplicated += 1
+            LOGGER.debug("%s Dropping duplicate message `%s`", self.log_id, message)
+            return
+
+        # Workaround due to how the OWNd library creates the entity ID,
+        # replacing zone=0 with zone=where_param
+        if isinstance(message, OWNHeatingEvent) and message.where == "0":
+            message._zone = 0
+
+        if self.telemetry_interval > 0 and _is_telemetry(message) and self._conflate(message):
+            return
+
+        await self._deliver_message(message)
+
+    async def _deliver_message(self, message) -> None:
+        if self.generate_events and self._should_fire_message_event(message):
+            if isinstance(message, OWNMessage):
+                _event_content = {"gateway": str(self.gateway.host)}
+                _event_content.update(message.event_content)
+                self.hass.bus.async_fire("myhome_message_event", _event_content)
+            else:
+                self.hass.bus.async_fire("myhome_message_event", {"gateway": str(self.gateway.host), "message": str(message)})
+
+        _handler = self._resolved_handlers.get(type(message))
+        if _handler is None:
+            _handler = self._resolve_message_handler(type(message))
+        await _handler(message)
+
+    def _set_connected(self) -> None:
+        self.is_connected = True
+        if self.disconnected_since is None:
+            return
+        _downtime = time.monotonic() - self.disconnected_since
+        self.disconnected_since = None
+        self.reconnect_count += 1
+        self.total_downtime += _downtime
+        LOGGER.info(
+            "%s Event session reconnected after %.1f s.",
+            self.log_id,
+            _downtime,
+        )
+        self._replay_remaining = len(self.send_buffer)
+        if self._replay_remaining:
+            LOGGER.info(
+                "%s Replaying %s messages queued while the gateway was unreachable.",
+                self.log_id,
+                self._replay_remaining,
+            )
+        self._online.set()
+        if self.resync_rate > 0:
+            self._cancel_resync()
+            self._resync_task = self.hass.async_create_task(self._resync())
+
+    def _set_disconnected(self) -> None:
+        self.is_connected = False
+        if self.disconnected_since is None:
+            self.disconnected_since = time.monotonic()
+            self._online.clear()
+            for _task in self.send_buffer.items():
+                self._set_expiry(_task)
+        self._cancel_resync()
+
+    def _cancel_resync(self) -> None:
+        if self._resync_task is not None and not self._resync_task.done():
+            self._resync_task.cancel()
+        self._resync_task = None
+
+    async def _resync(self) -> None:
+        """Request the state of every registered entity after a reconnection, paced to `resync_rate` per second."""
+        _entities = {_entity.unique_id: _entity for _members in self._routed_entities.values() for _entity in _members.values()}
+        LOGGER.debug(
+            "%s Resynchronizing %s entities.",
+            self.log_id,
+            len(_entities),
+        )
+        for _entity in _entities.values():
+            if not self.is_connected:
+                return
+            try:
+                await _entity.async_update()
+            except:
+                LOGGER.error(
+                    "%s Error resynchronizing `%s`",
                     self.log_id,
-                    message.human_readable_log,
+                    _entity.entity_id,
                 )
-            elif isinstance(message, OWNGatewayEvent) or isinstance(message, OWNGatewayCommand):
-                LOGGER.info(
-                    "%s %s",
+            await asyncio.sleep(1 / self.resync_rate)
+
+    @staticmethod
+    def _session_lost(session: OWNSession, stream_reader: asyncio.StreamReader) -> bool:
+        """Check if the connection behind `session` was closed or silently reopened by OWNd."""
+        return session._stream_reader is not stream_reader or stream_reader is None or stream_reader.at_eof()
+
+    async def listening_loop(self):
+        """Keep an event session open, reconnecting with a jittered exponential backoff when it drops."""
+        self._terminate_listener = False
+
+        LOGGER.debug("%s Creating listening worker.", self.log_id)
+
+        self.dispatching_worker = self.hass.loop.create_task(self._dispatching_loop())
+        _attempt = 0
+        while not self._terminate_listener:
+            _event_session = OWNEventSession(gateway=self.gateway, logger=LOGGER)
+            _connected_at = None
+            try:
+                _result = await _event_session.connect()
+                if not _result or not _result["Success"]:
+                    raise ConnectionError(_result["Message"] if _result else "connection refused")
+                self._set_connected()
+                _connected_at = self.last_frame_at = time.monotonic()
+                await self._listen(_event_session)
+            except (OSError, asyncio.IncompleteReadError) as err:
+                LOGGER.warning(
+                    "%s Event session lost: %s",
                     self.log_id,
-                    message.human_readable_log,
+                    err,
                 )
-            else:
-                LOGGER.info(
-                    "%s Unsupported message type: `%s`",
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(
+                    "%s Unexpected error in the listening worker:",
                     self.log_id,
-                    message,
                 )
+            finally:
+                try:
+                    await _event_session.close()
+                except:
+                    pass
+                self._set_disconnected()
+                # Only a session that delivered a frame or stayed up for a while resets the
+                # backoff, a gateway dropping every session right away is not hammered.
+                if _connected_at is not None and (
+                    self.last_frame_at > _connected_at or time.monotonic() - _connected_at >= RECONNECT_STABLE_TIME
+                ):
+                    _attempt = 0
 
-        await _event_session.close()
-        self.is_connected = False
+            if self._terminate_listener:
+                break
+            _delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**_attempt)
+            _delay = random.uniform(_delay / 2, _delay)
+            _attempt += 1
+            LOGGER.info(
+                "%s Reconnecting event session in %.1f s.",
+                self.log_id,
+                _delay,
+            )
+            await asyncio.sleep(_delay)
 
+        self.dispatching_worker.cancel()
         LOGGER.debug("%s Destroying listening worker.", self.log_id)
         self.listening_worker.cancel()
 
+    async def _next_message(self, event_session: OWNEventSession):
+        _stream_reader = event_session._stream_reader
+        if self.keepalive_interval > 0:
+            _idle = self.keepalive_interval - (time.monotonic() - self.last_frame_at)
+            try:
+                message = await asyncio.wait_for(event_session.get_next(), max(_idle, 0))
+            except asyncio.TimeoutError:
+                message = await self._probe_session(event_session)
+        else:
+            message = await event_session.get_next()
+        if message is None and self._session_lost(event_session, _stream_reader):
+            raise ConnectionError("connection closed by the gateway")
+        self.last_frame_at = time.monotonic()
+        return message
+
+    async def _probe_session(self, event_session: OWNEventSession):
+        """Ask the gateway for its time and wait for a frame, the session is considered stale if none arrives.
+
+        Some gateways only answer the probe on the command session, leaving the event session
+        silent on a quiet bus: keepalive is disabled by default for that reason.
+        """
+        LOGGER.debug(
+            "%s No frame received for %s s, probing the gateway.",
+            self.log_id,
+            self.keepalive_interval,
+        )
+        self.keepalive_probes += 1
+        await self.send_status_request(OWNCommand(KEEPALIVE_PROBE), lane=LANE_REFRESH)
+        try:
+            return await asyncio.wait_for(event_session.get_next(), self.keepalive_timeout)
+        except asyncio.TimeoutError:
+            self.stale_sessions += 1
+            raise ConnectionError(f"no frame received {self.keepalive_timeout} s after keepalive probe") from None
+
+    async def _listen(self, event_session: OWNEventSession) -> None:
+        """Read frames from the event session into the ingress queue, waiting for room when it is full."""
+        while not self._terminate_listener:
+            await self.ingress_queue.put(await self._next_message(event_session))
+
+    async def _dispatch_message(self, message) -> None:
+        try:
+            await self._process_message(message)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(
+                "%s Error processing message `%s`:",
+                self.log_id,
+                message,
+            )
+
+    async def _dispatching_loop(self) -> None:
+        """Process the frames queued by the listening worker, across reconnections."""
+        while not self._terminate_listener:
+            message = await self.ingress_queue.get()
+            if self.batch_window <= 0:
+                await self._dispatch_message(message)
+                continue
+
+            # Batched mode: keep draining frames for the duration of the window
+            # and write the state of each updated entity only once at the end.
+            self._pending_state_writes = {}
+            try:
+                await self._dispatch_message(message)
+                _batch_count = 1
+                _batch_deadline = self.hass.loop.time() + self.batch_window / 1000
+                while _batch_count < self.batch_size and not self._terminate_listener:
+                    _remaining = _batch_deadline - self.hass.loop.time()
+                    if _remaining <= 0:
+                        break
+                    try:
+                        message = await asyncio.wait_for(self.ingress_queue.get(), _remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    await self._dispatch_message(message)
+                    _batch_count += 1
+            finally:
+                self._flush_state_writes()
+
+    async def _transmit(self, command_session: OWNCommandSession, message, timeout: float) -> str:
+        """Write a frame on a command session and wait for the gateway to acknowledge it."""
+        command_session._stream_writer.write(encode_frame(message))
+        await command_session._stream_writer.drain()
+        return await self._read_outcome(command_session, message, timeout)
+
+    async def _read_outcome(
+        self, command_session: OWNCommandSession, message, timeout: float, first_timeout: float = None
+    ) -> str:
+        """Read the replies of a command session until the gateway acknowledges, refuses or defers `message`.
+
+        Raises asyncio.TimeoutError once the gateway stays silent for `timeout` seconds
+        (`first_timeout` before the first reply): a status request addressed to a whole
+        bus is answered with one frame per device and may take much longer than that.
+        """
+        _timeout = timeout if first_timeout is None else first_timeout
+        while True:
+            _response = (
+                await asyncio.wait_for(command_session._stream_reader.readuntil(OWNSession.SEPARATOR), _timeout)
+            ).decode()
+            _timeout = timeout
+            if _response == ACK_FRAME:
+                return OUTCOME_ACK
+            if _response == NACK_FRAME:
+                return OUTCOME_NACK
+            if _response == BUSY_FRAME:
+                return OUTCOME_BUSY
+            LOGGER.debug(
+                "%s Message `%s` received response `%s`.",
+                self.log_id,
+                message,
+                _response,
+            )
+
+    async def _open_command_session(self, command_session: OWNCommandSession, health: dict) -> bool:
+        """Open or reopen a command session, returns whether it succeeded."""
+        try:
+            await command_session.close()
+        except:
+            pass
+        try:
+            _result = await command_session.connect()
+        except OSError as err:
+            _result = {"Success": False, "Message": str(err)}
+        if _result and _result["Success"]:
+            return True
+        health["last_error"] = _result["Message"] if _result else "connection refused"
+        return False
+
+    async def _restore_command_session(self, command_session: OWNCommandSession, health: dict) -> bool:
+        """Reopen a broken command session with a jittered exponential backoff.
+
+        Returns False once `WORKER_MAX_RECONNECTS` attempts in a row failed.
+        """
+        for _attempt in range(WORKER_MAX_RECONNECTS):
+            _delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**_attempt)
+            await asyncio.sleep(random.uniform(_delay / 2, _delay))
+            health["reconnects"] += 1
+            if await self._open_command_session(command_session, health):
+                return True
+        return False
+
+    def _set_expiry(self, task: dict) -> None:
+        """Give a message queued while the gateway is unreachable a time to live, short for status requests."""
+        if self.disconnected_since is None:
+            task.pop("expires_at", None)
+        else:
+            _ttl = OFFLINE_STATUS_REQUEST_TTL if task["is_status_request"] else self.offline_command_ttl
+            task["expires_at"] = time.monotonic() + _ttl
+
+    async def _queue_task(self, task: dict) -> None:
+        """Put a message in the send buffer, keeping at most `offline_queue_size` messages while the gateway is unreachable.
+
+        The oldest message of the least urgent lane makes room for a new one, unless
+        that lane is more urgent than the new message, which is then dropped instead.
+        """
+        if self.disconnected_since is not None:
+            self._set_expiry(task)
+            while len(self.send_buffer) >= self.offline_queue_size:
+                _dropped = self.send_buffer.pop_least_urgent(task["lane"]) or task
+                self.offline_dropped += 1
+                LOGGER.warning(
+                    "%s Gateway unreachable with %s messages queued, dropping message `%s`.",
+                    self.log_id,
+                    len(self.send_buffer) + 1,
+                    _dropped["message"],
+                )
+                if self._queued_commands.get(_dropped.get("target")) is _dropped:
+                    del self._queued_commands[_dropped["target"]]
+                self._complete_task(_dropped, SendResult(OUTCOME_DROPPED, 0.0, 0))
+                if _dropped is task:
+                    return
+        await self.send_buffer.put(task, task["lane"])
+        self._scale_sending_workers()
+
+    async def _accept_task(self, task: dict) -> bool:
+        """Prepare a message taken from the send buffer, returns False if it expired instead."""
+        if self._queued_commands.get(task.get("target")) is task:
+            del self._queued_commands[task["target"]]
+        self._release_status_request(task)
+        _expired = task.get("expires_at", float("inf")) < time.monotonic()
+        if self._replay_remaining > 0:
+            self._replay_remaining -= 1
+            if not _expired:
+                # Messages held while the gateway was unreachable are replayed at a paced rate.
+                await self._replay_limiter.acquire()
+        if _expired:
+            self.messages_expired += 1
+            LOGGER.info(
+                "%s Message `%s` expired while the gateway was unreachable, not sending it.",
+                self.log_id,
+                task["message"],
+            )
+            self._complete_task(task, SendResult(OUTCOME_EXPIRED, 0.0, 0))
+            return False
+        return True
+
+    def _release_status_request(self, task: dict) -> None:
+        """Let identical status requests be queued again once this one leaves the send buffer."""
+        if task["is_status_request"] and self._pending_status_requests.get(str(task["message"])) is task:
+            del self._pending_status_requests[str(task["message"])]
+
+    def _complete_task(self, task: dict, result: SendResult) -> None:
+        self._release_status_request(task)
+        for _future in task["futures"]:
+            if not _future.done():
+                _future.set_result(result)
+
+    async def _send_task(self, command_session: OWNCommandSession, task: dict, health: dict) -> SendResult:
+        """Send a queued message, retrying NACKs, busy replies and timeouts with an exponential backoff.
+
+        Connection errors are raised for the worker to restore its session.
+        """
+        _attempt = 0
+        while True:
+            _attempt += 1
+            if self.send_limiter is not None:
+                await self.send_limiter.acquire()
+            _start = time.monotonic()
+            try:
+                _outcome = await self._transmit(command_session, task["message"], task["timeout"])
+            except asyncio.TimeoutError:
+                _outcome = OUTCOME_TIMEOUT
+            _rtt = time.monotonic() - _start
+            health["frames_sent"] += 1
+            if self.send_limiter is not None:
+                self.send_limiter.record(_is_congested(task, _outcome, _rtt))
+            if _outcome == OUTCOME_TIMEOUT:
+                # The session may still hold a late reply, start over on a new one.
+                health["last_error"] = f"no reply to `{task['message']}` within {task['timeout']} s"
+                await self._open_command_session(command_session, health)
+            if _outcome == OUTCOME_ACK or _attempt > task["retries"] or self._is_unanswered_status_request(task, _outcome):
+                break
+            LOGGER.warning(
+                "%s Could not send message `%s` (%s). Retrying (%d)...",
+                self.log_id,
+                task["message"],
+                _outcome,
+                _attempt,
+            )
+            await asyncio.sleep(SEND_RETRY_DELAY * 2 ** (_attempt - 1))
+
+        self._log_send_result(task, _outcome)
+        return SendResult(_outcome, _rtt, _attempt)
+
+    @staticmethod
+    def _is_unanswered_status_request(task: dict, outcome: str) -> bool:
+        """Tell whether a status request timed out: it is not sent again, the next refresh asks anew
+        and resending a request addressed to many devices would only add to the storm of replies."""
+        return outcome == OUTCOME_TIMEOUT and task["is_status_request"]
+
+    def _log_send_result(self, task: dict, outcome: str) -> None:
+        if outcome == OUTCOME_ACK:
+            LOGGER.log(
+                logging.DEBUG if task["is_status_request"] else logging.INFO,
+                "%s Message `%s` was successfully sent.",
+                self.log_id,
+                task["message"],
+            )
+        else:
+            LOGGER.error(
+                "%s Could not send message `%s` (%s). No more retries.",
+                self.log_id,
+                task["message"],
+                outcome,
+            )
+
+    async def _write_task(self, command_session: OWNCommandSession, task: dict) -> None:
+        if self.send_limiter is not None:
+            await self.send_limiter.acquire()
+        command_session._stream_writer.write(encode_frame(task["message"]))
+        await command_session._stream_writer.drain()
+        task["sent_at"] = time.monotonic()
+        task["attempts"] = task.get("attempts", 0) + 1
+
+    async def _send_pipelined(self, command_session: OWNCommandSession, in_flight: deque, health: dict) -> None:
+        """Send the messages in `in_flight`, then the queued ones, with up to `pipeline_depth` frames awaiting a reply.
+
+        The gateway answers the frames of a session in order, so each ACK, NACK or busy
+        reply resolves the oldest frame in flight. A frame is not sent while another one
+        for the same target is in flight, and once a frame is refused nothing new is
+        sent until the frames in flight are answered and the refused ones retried, so
+        commands for a device are always carried out in order. Connection errors are
+        raised with the unanswered messages left in `in_flight` for the worker to queue again.
+        """
+        _refused = deque()
+        _answered_at = 0.0
+        try:
+            for _task in in_flight:
+                await self._write_task(command_session, _task)
+            while in_flight or _refused:
+                if _refused and not in_flight:
+                    # Retry the oldest refused frame before sending anything else.
+                    _task = _refused.popleft()
+                    in_flight.append(_task)
+                    await asyncio.sleep(SEND_RETRY_DELAY * 2 ** (_task["attempts"] - 1))
+                    await self._write_task(command_session, _task)
+                while (
+                    not _refused
+                    and len(in_flight) < self.pipeline_depth
+                    and self._online.is_set()
+                    and not self._closing
+                ):
+                    _targets = {command_slot(_task["message"])[0] for _task in in_flight} - {None}
+                    _task = self.send_buffer.get_nowait(lambda task: command_slot(task["message"])[0] not in _targets)
+                    if _task is None:
+                        break
+                    in_flight.append(_task)
+                    if not await self._accept_task(_task):
+                        in_flight.pop()
+                        continue
+                    await self._write_task(command_session, _task)
+
+                _oldest = in_flight[0]
+                try:
+                    # The gateway answers frames in order: the oldest frame waits from the time
+                    # it was sent or the previous frame was answered, whichever is later. Filling
+                    # the window may have taken a while, leave a moment to read replies already
+                    # received before declaring it lost.
+                    _outcome = await self._read_outcome(
+                        command_session,
+                        _oldest["message"],
+                        _oldest["timeout"],
+                        max(SEND_RETRY_DELAY, max(_oldest["sent_at"], _answered_at) + _oldest["timeout"] - time.monotonic()),
+                    )
+                except asyncio.TimeoutError:
+                    _outcome = OUTCOME_TIMEOUT
+                _rtt = time.monotonic() - _oldest["sent_at"]
+                health["frames_sent"] += 1
+                if self.send_limiter is not None:
+                    self.send_limiter.record(_is_congested(_oldest, _outcome, _rtt))
+                if _outcome == OUTCOME_TIMEOUT:
+                    # Later replies can no longer be matched to their frames: every frame
+                    # in flight is sent again on a new session.
+                    health["last_error"] = f"no reply to `{_oldest['message']}` within {_oldest['timeout']} s"
+                    await self._open_command_session(command_session, health)
+                    _answered = list(in_flight)
+                    in_flight.clear()
+                else:
+                    _answered = [in_flight.popleft()]
+                _answered_at = time.monotonic()
+                for _task in _answered:
+                    if (
+                        _outcome == OUTCOME_ACK
+                        or _task["attempts"] > _task["retries"]
+                        or self._is_unanswered_status_request(_task, _outcome)
+                    ):
+                        self._log_send_result(_task, _outcome)
+                        self._complete_task(_task, SendResult(_outcome, _rtt, _task["attempts"]))
+                        continue
+                    LOGGER.warning(
+                        "%s Could not send message `%s` (%s). Retrying (%d)...",
+                        self.log_id,
+                        _task["message"],
+                        _outcome,
+                        _task["attempts"],
+                    )
+                    _refused.append(_task)
+        except BaseException:
+            in_flight.extendleft(reversed(_refused))
+            raise
+
+    def set_worker_bounds(self, min_workers: int, max_workers: int) -> None:
+        """Set how many sending workers may run, starting workers up to the minimum.
+
+        Workers above the maximum stop after their current message.
+        """
+        self.min_workers = min_workers
+        self.max_workers = max(min_workers, max_workers)
+        while len(self.sending_workers) < self.min_workers:
+            self._start_sending_worker()
+
+    def _start_sending_worker(self) -> None:
+        _worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        self.sending_workers[_worker_id] = self.hass.loop.create_task(self.sending_loop(_worker_id))
+
+    def _scale_sending_workers(self) -> None:
+        """Start one more sending worker if the send buffer is backing up."""
+        if (
+            len(self.sending_workers) >= self.max_workers
+            or self.disconnected_since is not None
+            or self._terminate_sender
+            or self._closing
+        ):
+            return
+        if (
+            len(self.send_buffer) > WORKER_SCALE_UP_DEPTH * len(self.sending_workers)
+            or self.send_buffer.oldest_wait() > WORKER_SCALE_UP_WAIT
+        ):
+            LOGGER.debug(
+                "%s %s messages waiting, adding a sending worker.",
+                self.log_id,
+                len(self.send_buffer),
+            )
+            self._start_sending_worker()
+
     async def sending_loop(self, worker_id: int):
         self._terminate_sender = False
 
@@ -405,47 +1288,241 @@ class MyHOMEGatewayHandler:
             worker_id,
         )
 
+        _health = self.worker_health[worker_id] = {"frames_sent": 0, "reconnects": 0, "last_error": None}
         _command_session = OWNCommandSession(gateway=self.gateway, logger=LOGGER)
-        await _command_session.connect()
-
-        while not self._terminate_sender:
-            task = await self.send_buffer.get()
-            LOGGER.debug(
-                "%s (%s) Message `%s` was successfully unqueued by worker %s.",
-                self.name,
-                self.gateway.host,
-                task["message"],
-                worker_id,
+        _healthy = False
+        try:
+            _healthy = await self._open_command_session(_command_session, _health) or await self._restore_command_session(
+                _command_session, _health
             )
-            await _command_session.send(message=task["message"], is_status_request=task["is_status_request"])
-            self.send_buffer.task_done()
 
-        await _command_session.close()
+            while _healthy and not self._terminate_sender:
+                if len(self.sending_workers) > self.max_workers:
+                    break
+                if not self._online.is_set():
+                    # Hold the queued messages until the gateway is reachable again.
+                    await self._online.wait()
+                    continue
+                if len(self.sending_workers) > self.min_workers:
+                    # Extra workers stop once they have been idle for a while.
+                    try:
+                        task = await asyncio.wait_for(self.send_buffer.get(), WORKER_IDLE_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        if len(self.sending_workers) > self.min_workers:
+                            break
+                        continue
+                else:
+                    task = await self.send_buffer.get()
+                if not self._online.is_set():
+                    await self.send_buffer.requeue(task, task["lane"])
+                    continue
+                _in_flight = deque([task])
+                try:
+                    if not await self._accept_task(task):
+                        continue
+                    LOGGER.debug(
+                        "%s (%s) Message `%s` was successfully unqueued by worker %s.",
+                        self.name,
+                        self.gateway.host,
+                        task["message"],
+                        worker_id,
+                    )
+                    if self.pipeline_depth > 1:
+                        await self._send_pipelined(_command_session, _in_flight, _health)
+                    else:
+                        _result = await self._send_task(_command_session, task, _health)
+                        _in_flight.clear()
+                        self._complete_task(task, _result)
+                except (OSError, asyncio.IncompleteReadError) as err:
+                    # The session is broken: give the unanswered messages back to the next
+                    # worker available and reconnect before taking another one.
+                    _health["last_error"] = str(err) or type(err).__name__
+                    LOGGER.warning(
+                        "%s Command session of worker %s lost: %s",
+                        self.log_id,
+                        worker_id,
+                        _health["last_error"],
+                    )
+                    for _task in reversed(_in_flight):
+                        _task["requeued"] = _task.get("requeued", 0) + 1
+                        if _task["requeued"] <= WORKER_MAX_RECONNECTS:
+                            await self.send_buffer.requeue(_task, _task["lane"])
+                        else:
+                            LOGGER.error(
+                                "%s Message `%s` was dropped after breaking %s command sessions.",
+                                self.log_id,
+                                _task["message"],
+                                _task["requeued"],
+                            )
+                            self._complete_task(_task, SendResult(OUTCOME_ERROR, 0.0, _task["requeued"]))
+                    _healthy = await self._restore_command_session(_command_session, _health)
+                except BaseException:
+                    for _task in _in_flight:
+                        self._complete_task(_task, SendResult(OUTCOME_CLOSED, 0.0, 0))
+                    raise
+        finally:
+            _worker = self.sending_workers.pop(worker_id)
+            del self.worker_health[worker_id]
+            try:
+                await _command_session.close()
+            except:
+                pass
+
+        if not _healthy and not (self._terminate_sender or self._closing):
+            if len(self.sending_workers) < self.min_workers:
+                LOGGER.error(
+                    "%s Sending worker %s keeps failing (%s), replacing it.",
+                    self.log_id,
+                    worker_id,
+                    _health["last_error"],
+                )
+                self.workers_replaced += 1
+                self._start_sending_worker()
+            else:
+                # An extra worker is not replaced: the gateway may refuse more sessions.
+                LOGGER.warning(
+                    "%s Extra sending worker %s keeps failing (%s), stopping it.",
+                    self.log_id,
+                    worker_id,
+                    _health["last_error"],
+                )
 
         LOGGER.debug(
             "%s Destroying sending worker %s",
             self.log_id,
             worker_id,
         )
-        self.sending_workers[worker_id].cancel()
+        _worker.cancel()
+
+    async def close_listener(self, drain_timeout: float = SHUTDOWN_DRAIN_TIMEOUT) -> bool:
+        """Stop the handler in a bounded time.
 
-    async def close_listener(self) -> bool:
+        New messages are refused and queued status requests dropped right away.
+        Queued commands are given up to `drain_timeout` seconds to be sent,
+        then every worker is cancelled and every session closed.
+        """
         LOGGER.info("%s Closing event listener", self.log_id)
+        self._closing = True
+        self._cancel_refreshes()
+        self._cancel_resync()
+        self._cancel_conflation()
+        _closed = SendResult(OUTCOME_CLOSED, 0.0, 0)
+        for _task in self.send_buffer.clear(LANE_REFRESH, LANE_POLL):
+            self._complete_task(_task, _closed)
+
+        _deadline = time.monotonic() + drain_timeout
+        while self.send_buffer.depth(LANE_COMMAND) and self.sending_workers and time.monotonic() < _deadline:
+            await asyncio.sleep(0.05)
+
         self._terminate_sender = True
         self._terminate_listener = True
+        for _task in self.send_buffer.clear():
+            self._complete_task(_task, _closed)
+        self._queued_commands.clear()
+
+        _workers = [
+            _worker
+            for _worker in [*self.sending_workers.values(), self.listening_worker, self.dispatching_worker]
+            if _worker is not None and not _worker.done()
+        ]
+        for _worker in _workers:
+            _worker.cancel()
+        if _workers:
+            await asyncio.wait(_workers, timeout=SHUTDOWN_CANCEL_TIMEOUT)
 
         return True
 
-    async def send(self, message: OWNCommand):
-        await self.send_buffer.put({"message": message, "is_status_request": False})
+    async def send(
+        self,
+        message: OWNCommand,
+        track: bool = False,
+        timeout: float = SEND_TIMEOUT,
+        retries: int = SEND_RETRIES,
+    ) -> Optional[asyncio.Future]:
+        """Queue a command, given as an `OWNCommand`, a raw frame or a prebuilt `CommandFrame`.
+
+        With `track`, returns a future resolved with the `SendResult` of the command once
+        the gateway acknowledged or refused it, or did not answer within `timeout`
+        seconds, after up to `retries` further attempts.
+        """
+        _future = self.hass.loop.create_future() if track else None
+        if self._closing:
+            LOGGER.debug(
+                "%s Closing, message `%s` was not queued.",
+                self.log_id,
+                message,
+            )
+            if _future is not None:
+                _future.set_result(SendResult(OUTCOME_CLOSED, 0.0, 0))
+            return _future
+        _task = {
+            "message": message,
+            "is_status_request": False,
+            "timeout": timeout,
+            "retries": retries,
+            "lane": LANE_COMMAND,
+            "futures": [_future] if _future is not None else [],
+        }
+        if self.collapse_commands:
+            # Last writer wins: a command replaces a queued one of the same kind for the same
+            # target, as long as nothing else was queued for that target in between.
+            _target, _kind = command_slot(message)
+            _last_queued = self._queued_commands.get(_target)
+            if _kind is not None and _last_queued is not None and _last_queued["kind"] == _kind:
+                self.commands_collapsed += 1
+                LOGGER.debug(
+                    "%s Message `%s` replaces queued message `%s`.",
+                    self.log_id,
+                    message,
+                    _last_queued["message"],
+                )
+                _last_queued.update({"message": message, "timeout": timeout, "retries": retries})
+                _last_queued["futures"].extend(_task["futures"])
+                self._set_expiry(_last_queued)
+                return _future
+            _task.update({"target": _target, "kind": _kind})
+            if _target is not None:
+                self._queued_commands[_target] = _task
+        await self._queue_task(_task)
         LOGGER.debug(
             "%s Message `%s` was successfully queued.",
             self.log_id,
             message,
         )
+        return _future
+
+    async def send_status_request(self, message: OWNCommand, lane: int = LANE_POLL):
+        """Queue a status request, in the poll lane unless it follows up on an event (`LANE_REFRESH`).
 
-    async def send_status_request(self, message: OWNCommand):
-        await self.send_buffer.put({"message": message, "is_status_request": True})
+        A request identical to one still queued is not queued again, the reply to
+        the queued one answers both; it is moved to `lane` if that is more urgent.
+        A request already sent may have been answered before the state it is meant
+        to read, so it does not count.
+        """
+        if self._closing:
+            return
+        _key = str(message)
+        if _key in self._pending_status_requests:
+            self.status_requests_deduplicated += 1
+            _pending = self._pending_status_requests[_key]
+            self._set_expiry(_pending)
+            if lane < _pending["lane"] and self.send_buffer.move(_pending, lane):
+                _pending["lane"] = lane
+            LOGGER.debug(
+                "%s Message `%s` is already pending, not queuing it again.",
+                self.log_id,
+                message,
+            )
+            return
+        self._pending_status_requests[_key] = _task = {
+            "message": message,
+            "is_status_request": True,
+            "timeout": SEND_TIMEOUT,
+            "retries": SEND_RETRIES,
+            "lane": lane,
+            "futures": [],
+        }
+        await self._queue_task(_task)
         LOGGER.debug(
             "%s Message `%s` was successfully queued.",
             self.log_id,
@@ -30,12 +30,14 @@ from .const import (
     CONF_WHO,
     CONF_WHERE,
     CONF_BUS_INTERFACE,
+    CONF_GROUPS,
     CONF_MANUFACTURER,
     CONF_DEVICE_MODEL,
     CONF_DIMMABLE,
     DOMAIN,
     LOGGER,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
 
@@ -56,6 +58,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             icon=_configured_lights[_light][CONF_ICON],
             icon_on=_configured_lights[_light][CONF_ICON_ON],
             interface=_configured_lights[_light][CONF_BUS_INTERFACE] if CONF_BUS_INTERFACE in _configured_lights[_light] else None,
+            groups=_configured_lights[_light][CONF_GROUPS],
             name=_configured_lights[_light][CONF_NAME],
             entity_name=_configured_lights[_light][CONF_ENTITY_NAME],
             dimmable=_configured_lights[_light][CONF_DIMMABLE],
@@ -98,6 +101,7 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
         who: str,
         where: str,
         interface: str,
+        groups: list,
         dimmable: bool,
         manufacturer: str,
         model: str,
@@ -118,7 +122,13 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
         self._attr_name = entity_name
 
         self._interface = interface
+        self._groups = groups
         self._full_where = f"{self._where}#4#{self._interface}" if self._interface is not None else self._where
+        self._on_frame = CommandFrame(OWNLightingCommand.switch_on(self._full_where))
+        self._off_frame = CommandFrame(OWNLightingCommand.switch_off(self._full_where))
+        self._status_frame = CommandFrame(
+            OWNLightingCommand.get_brightness(self._full_where) if dimmable else OWNLightingCommand.status(self._full_where)
+        )
 
         self._attr_supported_features = 0
         self._attr_supported_color_modes: set[ColorMode] = set()
@@ -154,10 +164,7 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
 
         Only used by the generic entity update service.
         """
-        if ColorMode.BRIGHTNESS in self._attr_supported_color_modes:
-            await self._gateway_handler.send_status_request(OWNLightingCommand.get_brightness(self._full_where))
-        else:
-            await self._gateway_handler.send_status_request(OWNLightingCommand.status(self._full_where))
+        await self._gateway_handler.send_status_request(self._status_frame)
 
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
@@ -192,7 +199,7 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
             else:
                 return await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where, int(kwargs[ATTR_TRANSITION])))
         else:
-            await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where))
+            await self._gateway_handler.send(self._on_frame)
             if ColorMode.BRIGHTNESS in self._attr_supported_color_modes:
                 await self.async_update()
 
@@ -208,7 +215,7 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
             elif kwargs[ATTR_FLASH] == FLASH_LONG:
                 return await self._gateway_handler.send(OWNLightingCommand.flash(self._full_where, 1.5))
 
-        return await self._gateway_handler.send(OWNLightingCommand.switch_off(self._full_where))
+        return await self._gateway_handler.send(self._off_frame)
 
     def handle_event(self, message: OWNLightingEvent):
         """Handle an event message."""
@@ -227,6 +234,6 @@ class MyHOMELight(MyHOMEEntity, LightEntity):
             if self._off_icon is not None and self._on_icon is not None:
                 self._attr_icon = self._on_icon if self._attr_is_on else self._off_icon
 
-            self.async_schedule_update_ha_state()
+            self.publish_state()
         except TypeError:
             pass
\ No newline at end of file
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .gateway import MyHOMEGatewayHandler
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.const import CONF_ENTITIES
 
@@ -39,6 +40,7 @@ class MyHOMEEntity(Entity):
         self._attr_name = None
         self._attr_entity_registry_enabled_default = True
         self._attr_should_poll = False
+        self._published_state = None
 
         self._attr_device_info = {
             "identifiers": {(DOMAIN, f"{gateway.mac}-{self._device_id}")},
@@ -48,12 +50,40 @@ class MyHOMEEntity(Entity):
             "via_device": (DOMAIN, self._gateway_handler.unique_id),
         }
 
+    @callback
+    def publish_state(self) -> None:
+        """Write the entity state, deferred to the end of the batch if the gateway is batching."""
+        if self._gateway_handler.is_batching:
+            self._gateway_handler.defer_state_write(self)
+        elif self.state_changed():
+            self.async_schedule_update_ha_state()
+
+    def state_changed(self) -> bool:
+        """Check if the state exposed to Home Assistant changed since it was last published."""
+        _state_attributes = self.state_attributes
+        _extra_state_attributes = self.extra_state_attributes
+        _snapshot = (
+            self.state,
+            self.available,
+            self.icon,
+            dict(_state_attributes) if _state_attributes is not None else None,
+            dict(_extra_state_attributes) if _extra_state_attributes is not None else None,
+        )
+        if _snapshot == self._published_state:
+            self._gateway_handler.state_writes_skipped += 1
+            return False
+        self._published_state = _snapshot
+        self._gateway_handler.state_writes_performed += 1
+        return True
+
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._platform] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if self._platform in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES]:
             del self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][self._platform][self._device_id][CONF_ENTITIES][self._platform]
@@ -251,10 +251,12 @@ class MyHOMEPowerSensor(MyHOMEEntity, SensorEntity):
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
             self._platform
         ][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if (
             self._attr_device_class
             in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
@@ -283,7 +285,7 @@ class MyHOMEPowerSensor(MyHOMEEntity, SensorEntity):
             message.human_readable_log,
         )
         self._attr_native_value = message.active_power
-        self.async_schedule_update_ha_state()
+        self.publish_state()
 
     async def start_sending_instant_power(self, duration):
         """Request automatic instant power."""
@@ -347,10 +349,12 @@ class MyHOMEEnergySensor(MyHOMEEntity, SensorEntity):
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
             self._platform
         ][self._device_id][CONF_ENTITIES][self._entity_specific_id] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if (
             self._entity_specific_id
             in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
@@ -418,7 +422,7 @@ class MyHOMEEnergySensor(MyHOMEEntity, SensorEntity):
                 message.human_readable_log,
             )
             self._attr_native_value = message.current_day_partial_consumption
-        self.async_schedule_update_ha_state()
+        self.publish_state()
 
 
 class MyHOMETemperatureSensor(MyHOMEEntity, SensorEntity):
@@ -466,10 +470,12 @@ class MyHOMETemperatureSensor(MyHOMEEntity, SensorEntity):
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
             self._platform
         ][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if (
             self._attr_device_class
             in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
@@ -504,7 +510,7 @@ class MyHOMETemperatureSensor(MyHOMEEntity, SensorEntity):
                 message.human_readable_log,
             )
             self._attr_native_value = message.main_temperature
-            self.async_schedule_update_ha_state()
+            self.publish_state()
         elif message.message_type == MESSAGE_TYPE_SECONDARY_TEMPERATURE:
             LOGGER.info(
                 "%s %s",
@@ -512,7 +518,7 @@ class MyHOMETemperatureSensor(MyHOMEEntity, SensorEntity):
                 message.human_readable_log,
             )
             self._attr_native_value = message.secondary_temperature[1]
-            self.async_schedule_update_ha_state()
+            self.publish_state()
 
 
 class MyHOMEIlluminanceSensor(MyHOMEEntity, SensorEntity):
@@ -560,10 +566,12 @@ class MyHOMEIlluminanceSensor(MyHOMEEntity, SensorEntity):
         self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
             self._platform
         ][self._device_id][CONF_ENTITIES][self._attr_device_class] = self
+        self._gateway_handler.register_entity(self._device_id, self)
         await self.async_update()
 
     async def async_will_remove_from_hass(self):
         """When entity is removed from hass."""
+        self._gateway_handler.unregister_entity(self._device_id, self)
         if (
             self._attr_device_class
             in self._hass.data[DOMAIN][self._gateway_handler.mac][CONF_PLATFORMS][
@@ -594,4 +602,4 @@ class MyHOMEIlluminanceSensor(MyHOMEEntity, SensorEntity):
             message.human_readable_log,
         )
         self._attr_native_value = message.illuminance
-        self.async_schedule_update_ha_state()
+        self.publish_state()
@@ -23,12 +23,14 @@ from .const import (
     CONF_WHO,
     CONF_WHERE,
     CONF_BUS_INTERFACE,
+    CONF_GROUPS,
     CONF_MANUFACTURER,
     CONF_DEVICE_MODEL,
     CONF_DEVICE_CLASS,
     DOMAIN,
     LOGGER,
 )
+from .frames import CommandFrame
 from .myhome_device import MyHOMEEntity
 from .gateway import MyHOMEGatewayHandler
 
@@ -49,6 +51,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             icon=_configured_switches[_switch][CONF_ICON],
             icon_on=_configured_switches[_switch][CONF_ICON_ON],
             interface=_configured_switches[_switch][CONF_BUS_INTERFACE] if CONF_BUS_INTERFACE in _configured_switches[_switch] else None,
+            groups=_configured_switches[_switch][CONF_GROUPS],
             name=_configured_switches[_switch][CONF_NAME],
             entity_name=_configured_switches[_switch][CONF_ENTITY_NAME],
             device_class=_configured_switches[_switch][CONF_DEVICE_CLASS],
@@ -83,6 +86,7 @@ class MyHOMESwitch(MyHOMEEntity, SwitchEntity):
         who: str,
         where: str,
         interface: str,
+        groups: list,
         device_class: str,
         manufacturer: str,
         model: str,
@@ -103,7 +107,11 @@ class MyHOMESwitch(MyHOMEEntity, SwitchEntity):
         self._attr_name = entity_name
 
         self._interface = interface
+        self._groups = groups
         self._full_where = f"{self._where}#4#{self._interface}" if self._interface is not None else self._where
+        self._on_frame = CommandFrame(OWNLightingCommand.switch_on(self._full_where))
+        self._off_frame = CommandFrame(OWNLightingCommand.switch_off(self._full_where))
+        self._status_frame = CommandFrame(OWNLightingCommand.status(self._where))
 
         self._attr_extra_state_attributes = {
             "A": where[: len(where) // 2],
@@ -127,15 +135,15 @@ class MyHOMESwitch(MyHOMEEntity, SwitchEntity):
 
         Only used by the generic entity update service.
         """
-        await self._gateway_handler.send_status_request(OWNLightingCommand.status(self._where))
+        await self._gateway_handler.send_status_request(self._status_frame)
 
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the device on."""
-        await self._gateway_handler.send(OWNLightingCommand.switch_on(self._full_where))
+        await self._gateway_handler.send(self._on_frame)
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the device off."""
-        await self._gateway_handler.send(OWNLightingCommand.switch_off(self._full_where))
+        await self._gateway_handler.send(self._off_frame)
 
     def handle_event(self, message: OWNLightingEvent):
         """Handle an event message."""
@@ -160,4 +168,4 @@ class MyHOMESwitch(MyHOMEEntity, SwitchEntity):
         self._attr_is_on = message.is_on
         if self._off_icon is not None and self._on_icon is not None:
             self._attr_icon = self._on_icon if self._attr_is_on else self._off_icon
-        self.async_schedule_update_ha_state()
+        self.publish_state()
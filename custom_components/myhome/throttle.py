@@ -0,0 +1,55 @@
+"""Rate limiting helpers for the MyHome gateway."""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows `rate` operations per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._timestamp = time.monotonic()
+
+    def _refill(self) -> None:
+        _now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (_now - self._timestamp) * self.rate)
+        self._timestamp = _now
+
+    def consume(self, tokens: float = 1) -> bool:
+        """Take `tokens` from the bucket if available, returns whether it was allowed."""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until `tokens` are available and take them."""
+        while not self.consume(tokens):
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket without bursts whose rate adapts to the other end (AIMD).
+
+    Each successful operation adds `increase / rate` to the rate, so it grows by
+    about `increase` per second of success, up to `max_rate`. Each congestion
+    signal multiplies the rate by `decrease`, down to `min_rate`.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float = 1.0, increase: float = 1.0, decrease: float = 0.5):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        super().__init__(max(self.min_rate, max_rate / 2), capacity=1)
+        self.increase = increase
+        self.decrease = decrease
+
+    def record(self, congested: bool) -> None:
+        """Adapt the rate to the result of an operation."""
+        self._refill()
+        if congested:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
@@ -47,6 +47,7 @@ from .const import (
     CONF_DEVICE_MODEL,
     CONF_DEVICE_CLASS,
     CONF_DIMMABLE,
+    CONF_GROUPS,
     CONF_ADVANCED_SHUTTER,
     CONF_INVERTED,
     CONF_HEATING_SUPPORT,
@@ -122,6 +123,21 @@ class Group(object):
         return "Where(%s, msg=%r)" % ("String", self.msg)
 
 
+class GroupMembership(object):
+    def __init__(self, msg=None):
+        self.msg = msg
+
+    def __call__(self, v):
+        _group = v[1:] if type(v) == str and v.startswith("#") else v
+        if type(_group) == str and _group.isdigit() and int(_group) >= 1 and int(_group) <= 255:
+            return f"#{int(_group)}"
+        else:
+            raise Invalid(f"Invalid group {v}, it must be a group number in [1-255].")
+
+    def __repr__(self):
+        return "GroupMembership(%s, msg=%r)" % ("String", self.msg)
+
+
 class PointToPoint(object):
     def __init__(self, msg=None):
         self.msg = msg
@@ -237,6 +253,8 @@ class MyHomeDeviceSchema(Schema):
                 data[device][CONF_ICON_ON] = None
             if CONF_ENTITY_NAME not in data[device]:
                 data[device][CONF_ENTITY_NAME] = None
+            if CONF_GROUPS not in data[device]:
+                data[device][CONF_GROUPS] = []
 
         return _rekeyed_data
 
@@ -293,6 +311,7 @@ light_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), GroupMembership())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ICON): str,
@@ -312,6 +331,7 @@ switch_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), GroupMembership())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ICON): str,
@@ -336,6 +356,7 @@ cover_schema = MyHomeDeviceSchema(
                 Coerce(str), Any(General(), Area(), Group(), PointToPoint(), msg="Invalid <WHERE>, expecting a valid General, Area, Group or Point-to-Point <WHERE>")
             ),
             Optional(CONF_BUS_INTERFACE): All(Coerce(str), BusInterface()),
+            Optional(CONF_GROUPS): [All(Coerce(str), GroupMembership())],
             Required(CONF_NAME): str,
             Optional(CONF_ENTITY_NAME): str,
             Optional(CONF_ADVANCED_SHUTTER, default=False): Boolean(),
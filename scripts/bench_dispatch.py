@@ -0,0 +1,146 @@
+"""Compare dispatching events through the routing index with the former hass.data walk.
+
+Usage: python scripts/bench_dispatch.py [--devices 900] [--frames 200000]
+
+Home Assistant is not needed: entities are stand-ins, and both dispatchers
+mirror the gateway handler, the per-platform walk of
+`hass.data[DOMAIN][mac][CONF_PLATFORMS]` that used to run for every frame and
+the index built by `MyHOMEGatewayHandler.register_entity` and read by
+`_dispatch_to_entities`.
+"""
+import argparse
+import random
+import timeit
+
+DOMAIN = "myhome"
+MAC = "00:03:50:00:00:01"
+CONF_PLATFORMS = "platforms"
+CONF_ENTITIES = "entities"
+BUTTON = "button"
+PLATFORMS = ("light", "switch", "cover", "climate", "binary_sensor", "sensor", BUTTON)
+
+
+class MyHOMEEntity:
+    def __init__(self, unique_id):
+        self.unique_id = unique_id
+        self.events = 0
+
+    def handle_event(self, message):
+        self.events += 1
+
+
+class DisableCommandButtonEntity(MyHOMEEntity):
+    pass
+
+
+class EnableCommandButtonEntity(MyHOMEEntity):
+    pass
+
+
+class Message:
+    def __init__(self, entity):
+        self.entity = entity
+
+
+def build_devices(devices: int):
+    """Lay out `devices` devices in hass.data as the platforms do, and return the device ids."""
+    _platforms = {_platform: {} for _platform in PLATFORMS}
+    _device_ids = []
+    for _index in range(devices):
+        _device_id = f"1-{_index}"
+        _device_ids.append(_device_id)
+        _kind = _index % 4
+        if _kind == 0:
+            _platforms["light"][_device_id] = {CONF_ENTITIES: {"light": MyHOMEEntity(f"{_device_id}-light")}}
+            _platforms[BUTTON][_device_id] = {
+                CONF_ENTITIES: {
+                    "disable": DisableCommandButtonEntity(f"{_device_id}-disable"),
+                    "enable": EnableCommandButtonEntity(f"{_device_id}-enable"),
+                }
+            }
+        elif _kind == 1:
+            _platforms["cover"][_device_id] = {CONF_ENTITIES: {"cover": MyHOMEEntity(f"{_device_id}-cover")}}
+        elif _kind == 2:
+            _platforms["switch"][_device_id] = {CONF_ENTITIES: {"switch": MyHOMEEntity(f"{_device_id}-switch")}}
+        else:
+            _platforms["sensor"][_device_id] = {
+                CONF_ENTITIES: {
+                    _sensor: MyHOMEEntity(f"{_device_id}-{_sensor}") for _sensor in ("power", "energy", "daily", "monthly")
+                }
+            }
+            _platforms["binary_sensor"][_device_id] = {CONF_ENTITIES: {"power": MyHOMEEntity(f"{_device_id}-binary")}}
+    return {DOMAIN: {MAC: {CONF_PLATFORMS: _platforms}}}, _device_ids
+
+
+def walk_dispatch(data, message) -> None:
+    for _platform in data[DOMAIN][MAC][CONF_PLATFORMS]:
+        if _platform != BUTTON and message.entity in data[DOMAIN][MAC][CONF_PLATFORMS][_platform]:
+            for _entity in data[DOMAIN][MAC][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES]:
+                if (
+                    isinstance(data[DOMAIN][MAC][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity], MyHOMEEntity)
+                    and not isinstance(
+                        data[DOMAIN][MAC][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
+                        DisableCommandButtonEntity,
+                    )
+                    and not isinstance(
+                        data[DOMAIN][MAC][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity],
+                        EnableCommandButtonEntity,
+                    )
+                ):
+                    try:
+                        data[DOMAIN][MAC][CONF_PLATFORMS][_platform][message.entity][CONF_ENTITIES][_entity].handle_event(message)
+                    except:
+                        pass
+
+
+def build_index(data):
+    """Register every entity except the lock/unlock buttons, as `MyHOMEEntity.async_added_to_hass` does."""
+    _members = {}
+    _routes = {}
+    for _platform, _devices in data[DOMAIN][MAC][CONF_PLATFORMS].items():
+        if _platform == BUTTON:
+            continue
+        for _device_id, _device in _devices.items():
+            for _entity in _device[CONF_ENTITIES].values():
+                _members.setdefault(_device_id, {})[_entity.unique_id] = _entity
+                _routes[_device_id] = tuple(_member.handle_event for _member in _members[_device_id].values())
+    return _routes
+
+
+def index_dispatch(routes, message) -> None:
+    for _handle_event in routes.get(message.entity, ()):
+        try:
+            _handle_event(message)
+        except:
+            pass
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--devices", type=int, default=900)
+    _parser.add_argument("--frames", type=int, default=200000)
+    _args = _parser.parse_args()
+
+    _data, _device_ids = build_devices(_args.devices)
+    _routes = build_index(_data)
+    _random = random.Random(0)
+    # A few frames for devices that are not configured, as on a real bus.
+    _messages = [Message(_random.choice(_device_ids) if _random.random() < 0.9 else "1-unknown") for _ in range(_args.frames)]
+
+    def _run_walk():
+        for _message in _messages:
+            walk_dispatch(_data, _message)
+
+    def _run_index():
+        for _message in _messages:
+            index_dispatch(_routes, _message)
+
+    _walk = min(timeit.repeat(_run_walk, number=1, repeat=5))
+    _index = min(timeit.repeat(_run_index, number=1, repeat=5))
+    print(f"{_args.devices} devices, {_args.frames} frames")
+    print(f"hass.data walk: {_walk * 1e9 / _args.frames:8.0f} ns/frame")
+    print(f"routing index:  {_index * 1e9 / _args.frames:8.0f} ns/frame ({_walk / _index:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Measure what prebuilt command frames save on a startup sweep of status requests.
+
+Usage: python scripts/bench_frames.py [--devices 1000]
+
+Needs OWNd (`pip install OWNd==0.7.49`), not Home Assistant. The sweep asks
+every device for its state once, as the entities do when added. Before, each
+request built an OWNd command from strings and the sender encoded it again;
+now each entity holds a `CommandFrame` built once and sent as is. Both passes
+queue and write their requests through the sender's own `command_slot` and
+`encode_frame`, loaded from the integration's frames.py.
+"""
+import argparse
+import gc
+import importlib.util
+import os
+import timeit
+import tracemalloc
+
+from OWNd.message import OWNAutomationCommand, OWNHeatingCommand, OWNLightingCommand
+
+_spec = importlib.util.spec_from_file_location(
+    "frames", os.path.join(os.path.dirname(__file__), "..", "custom_components", "myhome", "frames.py")
+)
+_frames = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_frames)
+CommandFrame = _frames.CommandFrame
+command_slot = _frames.command_slot
+encode_frame = _frames.encode_frame
+
+
+def build_status_request(kind: str, where: str):
+    """Build a status request the way the entities did on every update."""
+    if kind == "dimmer":
+        return OWNLightingCommand.get_brightness(where)
+    if kind == "light":
+        return OWNLightingCommand.status(where)
+    if kind == "cover":
+        return OWNAutomationCommand.status(where)
+    return OWNHeatingCommand.status(where)
+
+
+def build_devices(devices: int):
+    _kinds = ("dimmer", "light", "cover", "climate")
+    _devices = []
+    for _index in range(devices):
+        _kind = _kinds[_index % len(_kinds)]
+        _where = str(_index % 99 + 1) if _kind == "climate" else f"{_index // 100 + 1}{_index % 100:02d}"
+        _devices.append((_kind, _where))
+    return _devices
+
+
+def send(messages) -> list:
+    """Queue status requests and write them as the gateway handler does.
+
+    Each request is keyed by its frame to deduplicate it, queued as a task,
+    matched against the frames in flight by its target and encoded for the wire.
+    """
+    _queued = {}
+    for _message in messages:
+        _queued[str(_message)] = {"message": _message, "is_status_request": True}
+    for _task in _queued.values():
+        command_slot(_task["message"])
+        encode_frame(_task["message"])
+    return list(_queued.values())
+
+
+def sweep_built(devices) -> list:
+    """Send a status request per device, building each one."""
+    return send(build_status_request(_kind, _where) for _kind, _where in devices)
+
+
+def sweep_prebuilt(frames) -> list:
+    """Send the prebuilt status frame of each device."""
+    return send(frames)
+
+
+def retained(sweep, *args) -> tuple:
+    """Bytes and blocks allocated by a sweep and still held by its queued requests."""
+    gc.collect()
+    tracemalloc.start()
+    _before = tracemalloc.take_snapshot()
+    _queued = sweep(*args)
+    _after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    _stats = _after.compare_to(_before, "filename")
+    del _queued
+    return sum(_stat.size_diff for _stat in _stats), sum(_stat.count_diff for _stat in _stats)
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--devices", type=int, default=1000)
+    _args = _parser.parse_args()
+
+    _devices = build_devices(_args.devices)
+    sweep_built(_devices)  # Warm up the caches of OWNd and re.
+    tracemalloc.start()
+    _prebuilt = [CommandFrame(build_status_request(_kind, _where)) for _kind, _where in _devices]
+    gc.collect()
+    _held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    _built_bytes, _built_blocks = retained(sweep_built, _devices)
+    _prebuilt_bytes, _prebuilt_blocks = retained(sweep_prebuilt, _prebuilt)
+    _built_time = min(timeit.repeat(lambda: sweep_built(_devices), number=1, repeat=20))
+    _prebuilt_time = min(timeit.repeat(lambda: sweep_prebuilt(_prebuilt), number=1, repeat=20))
+
+    print(f"Startup sweep of {_args.devices} devices")
+    print(f"built per call: {_built_bytes / 1024:8.1f} KiB in {_built_blocks:6d} blocks, {_built_time * 1e3:6.2f} ms")
+    print(f"prebuilt:       {_prebuilt_bytes / 1024:8.1f} KiB in {_prebuilt_blocks:6d} blocks, {_prebuilt_time * 1e3:6.2f} ms")
+    print(f"prebuilt frames held by the entities: {_held / 1024:.1f} KiB, built once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure how long switch frames wait behind a telemetry flood, with and without dispatch reordering.
+
+Usage: python scripts/bench_ingress.py [--frames 5000] [--switch-every 50] [--window 64] [--load 0.9]
+
+Needs nothing but the integration's `buffers` module. Frames arrive in bursts
+of 100, as during an energy report storm, at `--load` times the rate the
+dispatcher handles them; one frame in `--switch-every` is a lighting event,
+the rest are telemetry. Above a load of 1 the backlog keeps growing and soon
+exceeds any reorder window. The wait reported is the time a frame spends in the ingress
+queue, the part of switch-to-UI latency that reordering acts on.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import time
+
+_spec = importlib.util.spec_from_file_location(
+    "buffers", os.path.join(os.path.dirname(__file__), "..", "custom_components", "myhome", "buffers.py")
+)
+_buffers = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_buffers)
+
+PRIORITY_LIGHTING = 0
+PRIORITY_TELEMETRY = 3
+HANDLING_TIME = 0.0002
+BURST = 100
+
+
+async def flood(frames: int, switch_every: int, window: int, load: float) -> _buffers.FrameQueue:
+    _queue = _buffers.FrameQueue(
+        frames,
+        reorder_window=window,
+        priority=lambda frame: frame[0],
+        ordering_key=lambda frame: frame[1],
+    )
+
+    async def _dispatch():
+        for _ in range(frames):
+            await _queue.get()
+            # Handling a frame is synchronous work in the event loop.
+            _deadline = time.perf_counter() + HANDLING_TIME
+            while time.perf_counter() < _deadline:
+                pass
+            await asyncio.sleep(0)
+
+    _dispatcher = asyncio.ensure_future(_dispatch())
+    for _index in range(frames):
+        if _index % switch_every == 0:
+            await _queue.put((PRIORITY_LIGHTING, f"light-{_index % 7}"))
+        else:
+            await _queue.put((PRIORITY_TELEMETRY, f"meter-{_index % 13}"))
+        if _index % BURST == BURST - 1:
+            await asyncio.sleep(HANDLING_TIME * BURST / load)
+    await _dispatcher
+    return _queue
+
+
+def main() -> None:
+    _parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _parser.add_argument("--frames", type=int, default=5000)
+    _parser.add_argument("--switch-every", type=int, default=50)
+    _parser.add_argument("--window", type=int, default=64)
+    _parser.add_argument("--load", type=float, default=0.9)
+    _args = _parser.parse_args()
+
+    print(f"{_args.frames} frames at {_args.load:.0%} load, one switch frame in {_args.switch_every}")
+    for _label, _window in (("FIFO", 0), (f"reorder window {_args.window}", _args.window)):
+        _queue = asyncio.run(flood(_args.frames, _args.switch_every, _window, _args.load))
+        print(
+            f"{_label:20s} switch p50 {_queue.wait_percentile(PRIORITY_LIGHTING, 50) * 1e3:7.1f} ms"
+            f"  p99 {_queue.wait_percentile(PRIORITY_LIGHTING, 99) * 1e3:7.1f} ms"
+            f"  telemetry p99 {_queue.wait_percentile(PRIORITY_TELEMETRY, 99) * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()